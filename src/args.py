@@ -4,11 +4,25 @@ import sys
 from src.config import cfg
 from src.ir import BUILTIN_FACTORIES
 from src.utils import random, mkdir
+from src.modules import checkpoint
 from src.modules.processor import ProgramProcessor
 
 
 cwd = os.getcwd()
 
+
+def parse_shard(value):
+    try:
+        shard, shards = (int(v) for v in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected i/N, got {!r}".format(value))
+    if shards <= 0 or not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError(
+            "expected 0 <= i < N, got {!r}".format(value))
+    return shard, shards
+
+
 parser = argparse.ArgumentParser()
 parser.add_argument(
     "-g", "--generator",
@@ -21,6 +35,13 @@ parser.add_argument(
     type=str,
     help="Path to API docs"
 )
+parser.add_argument(
+    "--api-graph-cache",
+    type=str,
+    default=None,
+    help=("Directory where snapshots of the built API graphs are cached "
+          "(used only with API-based program generation)")
+)
 parser.add_argument(
     "-s", "--seconds",
     type=int,
@@ -85,6 +106,20 @@ parser.add_argument(
     default=1,
     help='Number of programs to generate before invoking the compiler'
 )
+parser.add_argument(
+    "--pipeline-depth",
+    type=int,
+    default=0,
+    help=("Number of generated batches that can wait for compilation. When "
+          "set, generation and compilation run concurrently "
+          "(default: 0, i.e., generation waits for every compilation)")
+)
+parser.add_argument(
+    "--compiler-threads",
+    type=int,
+    default=1,
+    help="Number of threads compiling batches (used with --pipeline-depth)"
+)
 parser.add_argument(
     "-b", "--bugs",
     default=os.path.join(cwd, "bugs"),
@@ -133,6 +168,28 @@ parser.add_argument(
     default=None,
     help="Number of workers for processing test programs"
 )
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=None,
+    help=("Seed of the random generator. With --generator 'api', every "
+          "API encoding and every program is derived from this seed, so "
+          "that serial and parallel runs enumerate the same programs")
+)
+parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    default=None,
+    help=("Enumerate only the i-th out of N disjoint shards of the APIs, "
+          "given as i/N. All shards must use the same --seed "
+          "(used only with API-based program generation)")
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help=("Resume the testing session given by --name from its last "
+          "checkpoint (used only with API-based program generation)")
+)
 parser.add_argument(
     "-d", "--debug",
     action="store_true"
@@ -231,6 +288,36 @@ parser.add_argument(
     default=0.5,
     help="Probability of assigning an expression to a local variable"
 )
+parser.add_argument(
+    "--compiler-backend",
+    default="shell",
+    choices=["shell", "daemon"],
+    help=("How to invoke the compiler: 'shell' starts a new compiler process "
+          "for every batch, 'daemon' keeps a warm compiler JVM per worker "
+          "(experimental, requires --experimental; not supported for groovy)")
+)
+parser.add_argument(
+    "--experimental",
+    action="store_true",
+    help=("Enable experimental features that have not been tested against "
+          "real compilers yet (i.e., --compiler-backend daemon)")
+)
+parser.add_argument(
+    "--max-bisection-compilations",
+    type=int,
+    default=12,
+    help=("Maximum number of extra compiler invocations for isolating the "
+          "programs of a batch that crash the compiler (default: 12, 0 "
+          "reports every program of the batch)")
+)
+parser.add_argument(
+    "--program-format",
+    default="pickle",
+    choices=["pickle", "ir"],
+    help=("Format of the saved programs (*.bin files): 'pickle' is the "
+          "fastest, 'ir' is a versioned encoding of the IR that remains "
+          "loadable across changes of the code base (default: pickle)")
+)
 parser.add_argument(
     "--error-filter-patterns",
     default='',
@@ -246,6 +333,20 @@ args = parser.parse_args()
 args.test_directory = os.path.join(args.bugs, args.name)
 args.stop_cond = "timeout" if args.seconds else "iterations"
 args.temp_directory = os.path.join(cwd, "temp")
+args.resume_state = None
+if args.resume:
+    args.resume_state = checkpoint.load_checkpoint(
+        checkpoint.get_run_path(args.test_directory))
+    if args.resume_state is not None:
+        # Continue the enumeration of the interrupted run.
+        args.seed = args.resume_state["seed"]
+if args.seed is None and args.generator == "api" and args.shard is None:
+    # Every worker enumerates the same stream of API encodings, so all
+    # workers must agree on the seed. The seed also makes the enumeration
+    # resumable.
+    args.seed = random.integer(0, 2 ** 32)
+if args.seed is not None:
+    random.r.seed(args.seed)
 args.options = {
     "Generator": {
         "base": {},
@@ -256,6 +357,7 @@ args.options = {
             "erase-types": args.erase_types,
             "enable-expression-cache": args.enable_expression_cache,
             "path-search-strategy": args.path_search_strategy,
+            "seed": args.seed,
         }
     },
     'Translator': {
@@ -295,9 +397,20 @@ def validate_args(args):
     if args.seconds and args.iterations:
         sys.exit("Error: you should only set --seconds or --iterations")
 
-    if os.path.isdir(args.bugs) and args.name in os.listdir(args.bugs):
+    if not args.resume and os.path.isdir(args.bugs) and \
+            args.name in os.listdir(args.bugs):
         sys.exit("Error: --name {} already exists".format(args.name))
 
+    if args.resume and args.resume_state is None:
+        sys.exit("Error: there is no checkpoint to resume in {}".format(
+            args.test_directory))
+
+    if args.resume_state and (
+            args.resume_state["workers"] != args.workers or
+            args.resume_state["shard"] != args.shard):
+        sys.exit("You have to resume with the same --workers and --shard "
+                 "options as the interrupted run")
+
     if args.transformation_schedule and args.transformations:
         sys.exit("Options --transformation-schedule and --transfromations"
                  " are mutually exclusive. You can't use both.")
@@ -319,14 +432,25 @@ def validate_args(args):
     if args.rerun and args.batch:
         sys.exit("You cannot use -r option with the option --batch")
 
+    if args.pipeline_depth < 0:
+        sys.exit("The --pipeline-depth option should be >= 0")
+
+    if args.max_bisection_compilations < 0:
+        sys.exit("The --max-bisection-compilations option should be >= 0")
+
+    if args.compiler_threads <= 0:
+        sys.exit("The --compiler-threads option should be >= 1")
+
+    if args.pipeline_depth and (args.debug or args.rerun):
+        sys.exit("The --pipeline-depth option cannot be combined with "
+                 "-d or -r")
+
     if args.examine and not args.replay:
         sys.exit("You cannot use --examine option without the --replay option")
 
     if args.generator == "api" and not args.api_doc_path:
         sys.exit(("You need to provide the --api-doc-path option when using"
                   " --generator 'api'"))
-    if args.generator == "api" and args.workers is not None:
-        sys.exit("The 'api' generator cannot be used in parallel mode")
 
     if args.api_rules and not os.path.isfile(args.api_rules):
         sys.exit("You have to provide a valid file in --api-rules")
@@ -334,12 +458,29 @@ def validate_args(args):
     if args.generator != "api" and args.api_rules is not None:
         sys.exit(("The --api-rules option is only combined with "
                  "--generator 'api'"))
+    if args.generator != "api" and args.api_graph_cache is not None:
+        sys.exit("The --api-graph-cache option is only combined with "
+                 "--generator 'api'")
     if args.generator != "api" and args.library_path is not None:
         sys.exit("The --library_path option is only combined with "
                  "--generator 'api'")
+    if args.generator != "api" and (args.resume or args.shard):
+        sys.exit("The --resume and --shard options are only combined with "
+                 "--generator 'api'")
+    if args.shard and args.seed is None:
+        sys.exit("The --shard option requires the --seed option, so that "
+                 "all shards enumerate the APIs in the same order")
     if args.max_conditional_depth <= 0:
         sys.exit("The --max-conditional-depth option should be >= 1")
 
+    if args.compiler_backend == "daemon" and not args.experimental:
+        sys.exit("The 'daemon' compiler backend is experimental, as it has "
+                 "not been tested against real compilers yet; enable it with "
+                 "--experimental")
+
+    if args.compiler_backend == "daemon" and args.language == "groovy":
+        sys.exit("The 'daemon' compiler backend does not support groovy")
+
     if args.local_variable_prob < 0 or args.local_variable_prob > 1:
         sys.exit("--local-variable-prob should be between 0 and 1")
 
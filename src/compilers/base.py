@@ -1,10 +1,29 @@
 from collections import defaultdict
+import glob
+import os
 import re
+import shutil
+
+
+def get_compiler_home(executable, env_var):
+    """Find the installation directory of the given compiler."""
+    home = os.environ.get(env_var)
+    if home:
+        return home
+    path = shutil.which(executable)
+    if path is None:
+        return None
+    # The executable is found in the bin/ directory of the installation.
+    return os.path.dirname(os.path.dirname(os.path.realpath(path)))
 
 
 class BaseCompiler():
     ERROR_REGEX = None
     CRASH_REGEX = None
+    # The name of the compiler in the compiler server (see
+    # src/resources/CompileServer.java). None means that the compiler cannot
+    # run inside the compiler server.
+    DAEMON_NAME = None
 
     def __init__(self, input_name, filter_patterns=None, library_path=None):
         self.input_name = input_name
@@ -19,12 +38,34 @@ class BaseCompiler():
     def get_compiler_cmd(self):
         raise NotImplementedError('get_compiler_cmd() must be implemented')
 
+    @classmethod
+    def get_daemon_classpath(cls):
+        """The classpath where the compiler server finds the compiler."""
+        return None
+
     def get_filename(self, match):
         raise NotImplementedError('get_filename() must be implemented')
 
     def get_error_msg(self, match):
         raise NotImplementedError('get_error_msg() must be implemented')
 
+    def get_linked_files(self):
+        """
+        Map the targets of the symbolic links found in the input directory
+        to the links. The programs of a batch are links to the files of the
+        test cases (see `spool_program` in thalia.py), and some compilers
+        report the resolved path of a file instead of the given one.
+        """
+        if os.path.isdir(self.input_name):
+            paths = [os.path.join(root, f)
+                     for root, _, files in os.walk(self.input_name)
+                     for f in files]
+        else:
+            # The input is a pattern of the files (e.g., src/*/*.java).
+            paths = glob.glob(self.input_name)
+        return {os.path.realpath(path): path
+                for path in paths if os.path.islink(path)}
+
     def analyze_compiler_output(self, output):
         crash_match = re.search(self.CRASH_REGEX, output)
         if crash_match:
@@ -35,8 +76,11 @@ class BaseCompiler():
         for p in self.filter_patterns:
             filtered_output = re.sub(p, '', filtered_output)
         matches = re.findall(self.ERROR_REGEX, filtered_output)
+        links = self.get_linked_files() if matches else {}
         for match in matches:
             filename = self.get_filename(match)
+            if links and not os.path.islink(filename):
+                filename = links.get(os.path.realpath(filename), filename)
             error_msg = self.get_error_msg(match)
             failed[filename].append(error_msg)
         return failed, matches
@@ -0,0 +1,117 @@
+"""
+A compiler backend that keeps a warm compiler JVM per process.
+
+Instead of spawning a new compiler process for every batch of programs,
+this backend starts a long-lived compiler server (see
+`src/resources/CompileServer.java`) and sends it compile requests through a
+pipe. The server replies with the diagnostics of the compiler, which are
+then given to `BaseCompiler.analyze_compiler_output` as usual.
+"""
+import atexit
+import glob
+import os
+import subprocess as sp
+import threading
+from typing import List, Tuple
+
+
+SERVER_SOURCE = os.path.join(os.path.split(os.path.dirname(__file__))[0],
+                             "resources", "CompileServer.java")
+EXIT_MARKER = "@@thalia-exit "
+
+
+class CompilerDaemon():
+    def __init__(self, cmd: List[str]):
+        self.cmd = cmd
+        self.proc = None
+        # The compiler threads of the pipeline (see --compiler-threads)
+        # share the daemon of their process, but the server serves one
+        # request at a time through a single pipe.
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self.proc = sp.Popen(self.cmd, stdin=sp.PIPE, stdout=sp.PIPE,
+                             stderr=sp.STDOUT, encoding="utf-8")
+
+    def is_alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def compile(self, arguments: List[str]) -> Tuple[bool, str]:
+        """Send a compile request and return (status, compiler output)."""
+        with self._lock:
+            return self._compile(arguments)
+
+    def _compile(self, arguments: List[str]) -> Tuple[bool, str]:
+        if not self.is_alive():
+            self._start()
+        lines = []
+        try:
+            self.proc.stdin.write("\0".join(arguments) + "\n")
+            self.proc.stdin.flush()
+            for line in self.proc.stdout:
+                if line.startswith(EXIT_MARKER):
+                    status = int(line[len(EXIT_MARKER):])
+                    return status == 0, "".join(lines)
+                lines.append(line)
+        except (BrokenPipeError, OSError):
+            pass
+        # The server died in the middle of the request (e.g., the JVM ran
+        # out of memory). Its output is reported as the compiler output, and
+        # the server is restarted upon the next request.
+        self.close()
+        return False, "".join(lines)
+
+    def close(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, sp.TimeoutExpired):
+            self.proc.kill()
+        self.proc = None
+
+
+def get_server_cmd(compiler_cls) -> List[str]:
+    cmd = ['java', '-Xmx8g']
+    classpath = compiler_cls.get_daemon_classpath()
+    if classpath:
+        cmd.extend(['-cp', classpath])
+    return cmd + [SERVER_SOURCE, compiler_cls.DAEMON_NAME]
+
+
+def expand_arguments(arguments: List[str]) -> List[str]:
+    """Expand the wildcards that the shell would have expanded."""
+    expanded = []
+    for arg in arguments:
+        if '*' in arg:
+            expanded.extend(sorted(glob.glob(arg)) or [arg])
+        else:
+            expanded.append(arg)
+    return expanded
+
+
+# The daemons of the current process. Daemons are never shared between
+# processes, so every worker keeps its own warm compiler.
+_DAEMONS = {}
+
+
+def get_daemon(compiler_cls) -> CompilerDaemon:
+    key = (os.getpid(), compiler_cls)
+    daemon = _DAEMONS.get(key)
+    if daemon is None:
+        daemon = CompilerDaemon(get_server_cmd(compiler_cls))
+        _DAEMONS[key] = daemon
+    return daemon
+
+
+def compile_with_daemon(compiler) -> Tuple[bool, str]:
+    daemon = get_daemon(type(compiler))
+    return daemon.compile(expand_arguments(compiler.get_compiler_cmd()[1:]))
+
+
+@atexit.register
+def _close_daemons():
+    for (pid, _), daemon in _DAEMONS.items():
+        if pid == os.getpid():
+            daemon.close()
@@ -11,6 +11,8 @@ class JavaCompiler(BaseCompiler):
 
     CRASH_REGEX = re.compile(r'.*(at jdk\.)(.*)')
 
+    DAEMON_NAME = 'javac'
+
     def __init__(self, input_name, filter_patterns=None,
                  library_path=None):
         input_name = os.path.join(input_name, '*', '*.java')
@@ -1,6 +1,7 @@
+import os
 import re
 
-from src.compilers.base import BaseCompiler
+from src.compilers.base import BaseCompiler, get_compiler_home
 
 
 class KotlinCompiler(BaseCompiler):
@@ -11,6 +12,8 @@ class KotlinCompiler(BaseCompiler):
         re.MULTILINE
     )
 
+    DAEMON_NAME = 'kotlinc'
+
     def __init__(self, input_name, filter_patterns=None, library_path=None):
         super().__init__(input_name, filter_patterns, library_path)
 
@@ -18,6 +21,13 @@ class KotlinCompiler(BaseCompiler):
     def get_compiler_version(cls):
         return ['kotlinc', '-version']
 
+    @classmethod
+    def get_daemon_classpath(cls):
+        home = get_compiler_home('kotlinc', 'KOTLIN_HOME')
+        if home is None:
+            return None
+        return os.path.join(home, 'lib', 'kotlin-compiler.jar')
+
     def get_compiler_cmd(self):
         extra_options = []
         if self.library_path:
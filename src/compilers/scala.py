@@ -1,7 +1,7 @@
 import os
 import re
 
-from src.compilers.base import BaseCompiler
+from src.compilers.base import BaseCompiler, get_compiler_home
 
 
 class ScalaCompiler(BaseCompiler):
@@ -9,6 +9,8 @@ class ScalaCompiler(BaseCompiler):
         r"-- .*Error: (.*\.scala):\d+:\d+ -+\n((?:[^-]+))", re.MULTILINE)
     CRASH_REGEX = re.compile(r".*at dotty(.*)")
 
+    DAEMON_NAME = 'scalac'
+
     def __init__(self, input_name, filter_patterns=None, library_path=None):
         input_name = os.path.join(input_name, '*', '*.scala')
         super().__init__(input_name, filter_patterns, library_path)
@@ -17,6 +19,13 @@ class ScalaCompiler(BaseCompiler):
     def get_compiler_version(cls):
         return ['scalac', '-version']
 
+    @classmethod
+    def get_daemon_classpath(cls):
+        home = get_compiler_home('scalac', 'SCALA_HOME')
+        if home is None:
+            return None
+        return os.path.join(home, 'lib', '*')
+
     def get_compiler_cmd(self):
         extra_options = []
         if self.library_path:
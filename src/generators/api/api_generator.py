@@ -1,4 +1,4 @@
-from copy import deepcopy, copy
+from copy import copy
 import functools
 import itertools
 from typing import List, NamedTuple, Union
@@ -40,11 +40,24 @@ class ExprRes(NamedTuple):
                     str(self.path) + str(self.assignment_graph))
 
 
+class EnumerationCursor(NamedTuple):
+    """The position of the last program enumerated by an APIGenerator."""
+    encoding: int
+    # Either APIGenerator.TYPING_SEQUENCE or APIGenerator.CONDITIONAL.
+    phase: int
+    offset: int
+    program: int
+
+
 class APIGenerator(Generator):
     TEST_CASE_NAME = "test"
 
     TEST_NAMESPACE = ast.GLOBAL_NAMESPACE + (TEST_CASE_NAME,)
 
+    # The phases of enumerating the programs of an API encoding.
+    TYPING_SEQUENCE = 0
+    CONDITIONAL = 1
+
     API_GRAPH_BUILDERS = {
         "java": builder.JavaAPIGraphBuilder,
         "kotlin": builder.KotlinAPIGraphBuilder,
@@ -52,20 +65,29 @@ class APIGenerator(Generator):
         "scala": builder.ScalaAPIGraphBuilder,
     }
 
-    def __init__(self, api_docs, options={}, language=None, logger=None):
+    def __init__(self, api_docs=None, options={}, language=None,
+                 logger=None, api_graph=None):
         super().__init__(language=language, logger=logger)
         if self.logger:
             self.logger.update_filename("api-generator")
-        self.api_graph = self.API_GRAPH_BUILDERS[language](
+        # The caller can provide an already built API graph (e.g., one loaded
+        # from the cache of API graphs).
+        self.api_graph = api_graph or self.API_GRAPH_BUILDERS[language](
             language, **options).build(api_docs)
         api_rules_file = options.get("api-rules")
-        kwargs = {}
+        self.matcher = None
         if api_rules_file:
-            kwargs["matcher"] = match.parse_rule_file(api_rules_file)
-        self.log_api_graph_statistics(**kwargs)
-        self.encodings = self.api_graph.encode_api_components(**kwargs)
+            self.matcher = match.parse_rule_file(api_rules_file)
+        self.log_api_graph_statistics(self.matcher)
+        self.seed = options.get("seed")
+        # A pair (i, n) that restricts enumeration to the i-th out of n
+        # disjoint shards of the APIs.
+        self.shard = options.get("shard")
+        self.encodings = self.api_graph.encode_api_components(
+            self.matcher, shard=self.shard)
         self.visited = set()
         self.visited_exprs = {}
+        self.cursor: EnumerationCursor = None
         self.programs_gen = self.compute_programs()
         self._has_next = True
 
@@ -127,7 +149,13 @@ class APIGenerator(Generator):
             body=ast.Block(body),
             func_type=ast.FunctionDeclaration.FUNCTION)
         self._add_node_to_parent(self.namespace[:-1], main_func)
-        return ast.Program(deepcopy(self.context), self.language)
+        # The program takes over the context of the test case. The nodes
+        # of the context are not shared with any other program (see the
+        # expression cache in `_generate_expr_from_node`), while types are
+        # never modified in place (see `ast.copy_nodes`).
+        program = ast.Program(self.context, self.language)
+        self.context = None
+        return program
 
     def log_program_info(self, program_id, api, receivers, parameters,
                          return_type, type_var_map, is_incorrect):
@@ -224,8 +252,11 @@ class APIGenerator(Generator):
 
     def generate_test_case_conditional(self, encoding, return_type,
                                        pid, is_incorrect: bool) -> ast.Program:
-        types = (encoding.receivers, *encoding.parameters,
-                 encoding.returns)
+        # Sort the types before sampling them, as the order of a frozenset
+        # depends on the hashes of its types.
+        types = [sorted(t, key=str) for t in (encoding.receivers,
+                                              *encoding.parameters,
+                                              encoding.returns)]
         parameters = [
             utils.random.sample(t, min(self.max_conditional_depth + 1, len(t)))
             for t in types[1:-1]
@@ -284,7 +315,10 @@ class APIGenerator(Generator):
 
     def compute_typing_sequences(self, encoding, types):
         if not self.inject_error_mode:
-            return itertools.product(*types), False
+            # Enumerate the typing sequences in a fixed order, so that a
+            # resumed run can skip the sequences enumerated before.
+            return itertools.product(*(sorted(t, key=str) for t in types)), \
+                False
 
         self.api_graph.add_types(encoding.type_parameters)
         finj = fi.FaultInjection(self.api_graph, self.bt_factory)
@@ -292,18 +326,53 @@ class APIGenerator(Generator):
         self.api_graph.remove_types(encoding.type_parameters)
         return typing_seqs, True
 
+    def _reseed(self, *keys):
+        # Derive the random choices of every program from the seed, so that
+        # a program does not depend on the programs generated before it.
+        if self.seed is not None:
+            utils.random.seed(self.seed, *keys)
+
+    def get_checkpoint(self) -> dict:
+        """Return the state needed for resuming the enumeration."""
+        return {"cursor": self.cursor, "visited": set(self.visited)}
+
+    def restore_checkpoint(self, state: dict):
+        """Continue the enumeration right after the given checkpoint."""
+        self.cursor = state["cursor"]
+        self.visited = set(state["visited"])
+        start = 0 if self.cursor is None else self.cursor.encoding
+        self.encodings = self.api_graph.encode_api_components(
+            self.matcher, start, self.shard)
+        self.programs_gen = self.compute_programs()
+        self._has_next = True
+
     def compute_programs(self):
-        i = 1
+        # The cursor of the checkpoint we resume from (if any).
+        resumed = self.cursor
+        i = 1 if resumed is None else resumed.program + 1
         for encoding in self.encodings:
+            index = encoding.position
             types = (encoding.receivers, *encoding.parameters,
                      encoding.returns)
-            if types in self.visited:
+            # Only the encodings of APIs with the same signature are
+            # duplicates, as these APIs always belong to the same shard. This
+            # way, every shard skips exactly the same duplicate encodings as a
+            # serial run does.
+            key = (self.api_graph.get_signature(encoding.api), types)
+            # The encoding of the checkpoint we resume from has been already
+            # marked as visited, but some of its programs remain.
+            resuming = resumed is not None and index == resumed.encoding
+            if key in self.visited and not resuming:
                 continue
-            self.visited.add(types)
+            self.visited.add(key)
             try:
+                self._reseed(index, "typing-sequences")
                 typing_seqs, is_incorrect = self.compute_typing_sequences(
                     encoding, types)
-                for typing_seq in typing_seqs:
+                for j, typing_seq in enumerate(typing_seqs):
+                    if resuming and (self.TYPING_SEQUENCE, j) <= (
+                            resumed.phase, resumed.offset):
+                        continue
                     overloaded_methods = self.api_graph.get_overloaded_methods(
                         typing_seq[0],
                         encoding.api,
@@ -312,19 +381,28 @@ class APIGenerator(Generator):
                                             typing_seq):
                         continue
 
+                    self._reseed(index, j)
+                    self.cursor = EnumerationCursor(
+                        index, self.TYPING_SEQUENCE, j, i)
                     yield self.generate_test_case_from_combination(typing_seq,
                                                                    encoding, i,
                                                                    is_incorrect)
                     i += 1
-                for ret in types[-1]:
+                for j, ret in enumerate(sorted(types[-1], key=str)):
+                    if resuming and (self.CONDITIONAL, j) <= (
+                            resumed.phase, resumed.offset):
+                        continue
                     # Merge receivers and parameters, and generate a test
                     # case with conditionals
+                    self._reseed(index, "cond", j)
                     program = self.generate_test_case_conditional(encoding,
                                                                   ret, i,
                                                                   is_incorrect)
                     if program is None:
                         # No conditional can be created
                         continue
+                    self.cursor = EnumerationCursor(
+                        index, self.CONDITIONAL, j, i)
                     yield program
                     i += 1
             except Exception as e:
@@ -517,11 +595,8 @@ class APIGenerator(Generator):
                     type_var_map=type_var_map, rec_bound_handler=handler)
                 type_var_map.update(sub)
             if rec_type.is_type_constructor():
-                rec_type, sub = tu.instantiate_type_constructor(
-                    rec_type, self.api_graph.get_reg_types(),
-                    type_var_map=type_var_map,
-                    rec_bound_handler=handler
-                )
+                rec_type, sub = self.api_graph.instantiate_type_constructor(
+                    rec_type, type_var_map)
                 type_var_map.update(sub)
             rec_type = self.substitute_types([rec_type], type_var_map)[0]
             rec = (
@@ -602,17 +677,15 @@ class APIGenerator(Generator):
     def _generate_expr_from_node(self, node, depth=1, constraints=None):
         if depth > cfg.limits.max_depth:
             if node.is_type_constructor():
-                handler = self.api_graph.get_instantiations_of_recursive_bound
-                t, type_var_map = tu.instantiate_type_constructor(
-                    node, self.api_graph.get_reg_types(),
-                    rec_bound_handler=handler, type_var_map=constraints
-                )
+                t, type_var_map = self.api_graph.instantiate_type_constructor(
+                    node, constraints)
             else:
                 t, type_var_map = node, {}
             return ExprRes(self.generate_expr(t), type_var_map, [t])
         stored_expr = self.visited_exprs.get(node)
         if stored_expr:
-            return stored_expr
+            # Every program gets its own copy of the cached expression.
+            return stored_expr._replace(expr=ast.copy_nodes(stored_expr.expr))
         if node == self.api_graph.EMPTY:
             return ExprRes(None, {}, [])
         target_selection = self._get_target_selection(node)
@@ -621,12 +694,8 @@ class APIGenerator(Generator):
             target_selection=target_selection, infeasible=False)
         if not path:
             if node.is_type_constructor():
-                handler = self.api_graph.get_instantiations_of_recursive_bound
-                t, type_var_map = tu.instantiate_type_constructor(
-                    node, self.api_graph.get_reg_types(),
-                    rec_bound_handler=handler,
-                    type_var_map=constraints
-                )
+                t, type_var_map = self.api_graph.instantiate_type_constructor(
+                    node, constraints)
             else:
                 t = node
                 type_var_map = (
@@ -643,7 +712,8 @@ class APIGenerator(Generator):
             # this expression for later use because it refers to a variable
             # that is no longer valid.
             if self.enable_expression_cache:
-                self.visited_exprs[node] = ExprRes(expr, type_var_map, path)
+                self.visited_exprs[node] = ExprRes(ast.copy_nodes(expr),
+                                                   type_var_map, path)
         return ExprRes(expr, type_var_map, path)
 
     def _generate_args(self, parameters, actual_types, depth,
@@ -660,9 +730,8 @@ class APIGenerator(Generator):
                 # If encountering a raw type, instantiate the corresponding
                 # type constructor.
                 if param_t.is_type_constructor():
-                    param_types[i] = tu.instantiate_type_constructor(
-                        param_t, self.api_graph.get_reg_types(), True,
-                        rec_bound_handler=self.api_graph.get_instantiations_of_recursive_bound)
+                    param_types[i] = \
+                        self.api_graph.instantiate_type_constructor(param_t)
             expr = self.generate_expr_from_nodes(param_types, {},
                                                  func_ref=True,
                                                  depth=depth)
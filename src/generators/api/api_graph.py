@@ -1,7 +1,8 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from copy import copy
 import itertools
 import statistics
+import zlib
 from typing import NamedTuple, List, Union, Set, Dict, Tuple
 
 import networkx as nx
@@ -13,12 +14,16 @@ from src.generators.api import utils as au
 from src.generators.api.matcher import Matcher
 from src.generators.api.nodes import (Field, Method, Constructor, Variable,
                                       Parameter)
+from src.generators.api.source_index import SourceIndex
 
 
 IN = 0
 OUT = 1
 WIDENING = 2
 PROTECTED = "protected"
+# A dependency of the memoized results that are computed from the pool of the
+# available types (see `APIGraph.get_reg_types`).
+_REG_TYPES = object()
 
 
 def compatible(type_var_map: dict, type_var_map2: dict,
@@ -35,6 +40,17 @@ APINode = Union[Field, Method, Constructor, tp.Type, Variable]
 APIPath = List[APINode]
 
 
+def _uses_reg_types(t_constructor: tp.TypeConstructor,
+                    type_var_map: dict) -> bool:
+    # Whether the instantiation of the given type constructor selects types
+    # from the pool of the available types.
+    for type_param in t_constructor.type_parameters:
+        t = type_var_map.get(type_param)
+        if t is None or t.is_type_constructor():
+            return True
+    return False
+
+
 def _get_signatures_size(api_graph, nodes):
     # Get the size of API signagures.
     signatures = []
@@ -54,6 +70,14 @@ def _get_signatures_size(api_graph, nodes):
     return signatures
 
 
+def _get_node_key(node: APINode) -> tuple:
+    # A key that orders API nodes independently of their hashes. Some APIs
+    # differ only in their name (e.g., the same method found under its
+    # simple and its qualified name).
+    return (node.__class__.__name__, repr(node), node.name,
+            str(getattr(node, "metadata", "")))
+
+
 class APIEncoding(NamedTuple):
     api: APINode
     receivers: Set[tp.Type]
@@ -61,6 +85,8 @@ class APIEncoding(NamedTuple):
     returns: Set[tp.Type]
     type_var_map: dict
     type_parameters: List[tp.TypeParameter]
+    # The position of the API in the (shuffled) order of API components.
+    position: int = 0
 
 
 def _get_type_variables(path: list) -> List[tp.TypeParameter]:
@@ -96,6 +122,8 @@ class APIGraph():
     EMPTY = 0
     DEFAULT_PATH_SEARCH_STRATEGY = "shortest"
     MAX_TYPES = 10
+    # The maximum number of targets whose BFS distances are memoized.
+    MAX_CACHED_TARGETS = 256
 
     # A set of blacklisted types. These types cannot be used as an upper bound
     # of type parameters.
@@ -126,7 +154,7 @@ class APIGraph():
     }
 
     def __init__(self, api_graph, subtyping_graph, functional_types,
-                 bt_factory, **kwargs):
+                 bt_factory, source_index=None, **kwargs):
         self.api_graph: nx.DiGraph = api_graph
         self.subtyping_graph: nx.DiGraph = subtyping_graph
         self.functional_types: Dict[tp.Type, tp.ParameterizedType] = \
@@ -134,7 +162,14 @@ class APIGraph():
         self.bt_factory = bt_factory
         self._all_types = {node.name: node
                            for node in self.subtyping_graph.nodes()}
+        self.source_index = source_index or SourceIndex(self.api_graph)
         self.source_nodes_of = {}
+        self._distances_to = OrderedDict()
+        # The nodes where the variables of the current program are attached.
+        self._variables = {}
+        # The signatures of the methods and constructors grouped by their
+        # number of parameters (see `get_function_refs_of`).
+        self._function_signatures = None
         self.disable_bounded_type_parameters = kwargs.get(
             "disable_bounded_type_parameters", False)
         self.path_search_strategy = kwargs.get(
@@ -142,6 +177,12 @@ class APIGraph():
         self.inject_type_error = kwargs.get(
             "inject-type-error", False
         )
+        # When a seed is given, every API encoding is computed from its own
+        # random stream, so the encodings do not depend on the random choices
+        # made while generating programs from the previous encodings.
+        self.seed = kwargs.get("seed")
+        # Memoized subtyping computations per method (see `_memoized`).
+        self._memo = defaultdict(dict)
         self.types = [
             t
             for t in self.subtyping_graph.nodes()
@@ -153,6 +194,10 @@ class APIGraph():
         ]
         self.type_constructors = [t for t in self.types
                                   if t.is_type_constructor()]
+        # The types that instantiate type constructors (see
+        # `get_available_types`). They are dropped whenever `self.types`
+        # changes.
+        self._available_types = {}
 
     def statistics(self, matcher=None) -> APIGraphStatistics:
         class _Type(NamedTuple):
@@ -201,6 +246,30 @@ class APIGraph():
     def get_reg_types(self):
         return self.types
 
+    def get_available_types(self, type_constructor: tp.TypeConstructor):
+        """
+        Return the types that can instantiate the type parameters of the
+        given type constructor, i.e., the regular types of the graph with
+        primitives boxed.
+        """
+        # Only arrays restrict their type arguments.
+        is_array = type_constructor.name == 'Array'
+        types = self._available_types.get(is_array)
+        if types is None:
+            types = tu._get_available_types(type_constructor,
+                                            self.get_reg_types(), True,
+                                            primitives=False)
+            self._available_types[is_array] = types
+        return types
+
+    def instantiate_type_constructor(self, type_constructor, type_var_map=None):
+        """Instantiate the given type constructor with the types of the graph.
+        """
+        return tu.instantiate_type_constructor(
+            type_constructor, self.get_available_types(type_constructor),
+            only_regular=False, type_var_map=type_var_map,
+            rec_bound_handler=self.get_instantiations_of_recursive_bound)
+
     def _get_random_type(self, types):
         t = tu.select_random_type(types)
         if t.is_type_constructor():
@@ -249,65 +318,123 @@ class APIGraph():
                 type_var_map[type_v] = assignment
         return type_var_map
 
-    def subtypes_of_parameterized(self, node):
-        possible_type_args = []
-        subtypes = set()
+    def _memoized(self, compute, key):
+        """
+        Return the memoized result of `compute(key)`.
+
+        A result is a pair (value, dependencies), where dependencies are the
+        nodes of the subtyping graph visited while computing the value (see
+        `_invalidate_memo`).
+        """
+        memo = self._memo[compute.__name__]
+        entry = memo.get(key)
+        if entry is None:
+            if self.seed is None:
+                entry = compute(key)
+            else:
+                # Compute the entry from its own random stream, so that the
+                # memoized value does not depend on when it is first
+                # requested.
+                with utils.random.isolated(self.seed, compute.__name__, key):
+                    entry = compute(key)
+            memo[key] = entry
+        return entry
+
+    def _invalidate_memo(self, nodes):
+        """
+        Drop the memoized results that depend on the given nodes of the
+        subtyping graph, or on the pool of the available types.
+        """
+        if not nodes:
+            return
+        nodes = set(nodes)
+        nodes.add(_REG_TYPES)
+        for memo in self._memo.values():
+            stale = [k for k, (_, deps) in memo.items()
+                     if not nodes.isdisjoint(deps)]
+            for k in stale:
+                del memo[k]
+
+    def _type_arg_candidates(self, node):
+        # For every type argument, compute the candidate type arguments of
+        # the subtypes of node, and whether we need to sample them.
+        candidates = []
+        deps = set()
         for i, t_arg in enumerate(node.type_args):
             type_param = node.t_constructor.type_parameters[i]
             # Type argument not wildcard, type parameter invariant
             if not t_arg.is_wildcard() and type_param.is_invariant():
-                possible_type_args.append([t_arg])
+                candidates.append(((t_arg,), False))
                 continue
 
             # Type argument invariant
             if t_arg.is_wildcard() and t_arg.is_invariant():
                 if type_param.bound:
-                    types = self.subtypes(type_param.bound)
+                    types, sub_deps = self._subtypes(type_param.bound)
+                    types = types | {type_param.bound}
                 else:
                     types = [t for t in self.get_reg_types()
                              if not t.is_type_constructor()]
-                possible_type_args.append(utils.random.sample(
-                    types, min(self.MAX_TYPES, len(types))))
+                    sub_deps = {_REG_TYPES}
 
             # Type argument covariant or type param covariant
             elif ((t_arg.is_wildcard() and t_arg.is_covariant()) or
                   type_param.is_covariant()):
-                types = {t_arg}
+                types, sub_deps = {t_arg}, ()
                 if t_arg != self.bt_factory.get_any_type():
                     base_t = t_arg.bound if t_arg.is_wildcard() else t_arg
+                    types, sub_deps = self._subtypes(base_t)
                     types = {
-                        n for n in self.subtypes(base_t)
+                        n for n in types | {base_t}
                         if not n.is_type_constructor()
                     }
-                possible_type_args.append(utils.random.sample(
-                    types, min(self.MAX_TYPES, len(types))))
             # Type argument contravariant or type param contravariant
             else:
                 base_t = t_arg.bound if t_arg.is_wildcard() else t_arg
-                types = self.supertypes(base_t)
-                possible_type_args.append(utils.random.sample(
-                    types, min(self.MAX_TYPES, len(types))))
+                types, sub_deps = self._supertypes(base_t)
+            deps.update(sub_deps)
+            candidates.append((tuple(sorted(types, key=str)), True))
+        return tuple(candidates), frozenset(deps)
+
+    def _subtypes_of_parameterized(self, node):
+        candidates, deps = self._memoized(self._type_arg_candidates, node)
+        # The type arguments are sampled on every call (not memoized), so
+        # that we explore different subtypes every time.
+        possible_type_args = [
+            utils.random.sample(types, min(self.MAX_TYPES, len(types)))
+            if sample else types
+            for types, sample in candidates
+        ]
+        deps = set(deps)
+        subtypes = set()
         for combination in itertools.product(*possible_type_args):
             t_constructor = self.get_type_by_name(
                 node.name) or node.t_constructor
             new_sub = t_constructor.new(list(combination))
             subtypes.add(new_sub)
-            subtypes.update(self.subtypes_of_parameterized_inheritance(
-                new_sub))
-        return subtypes
+            inh_subtypes, inh_deps = self._memoized(
+                self._subtypes_of_parameterized_inheritance, new_sub)
+            subtypes.update(inh_subtypes)
+            deps.update(inh_deps)
+        return subtypes, deps
 
-    def subtypes_of_parameterized_inheritance(
+    def subtypes_of_parameterized(self, node):
+        return self._subtypes_of_parameterized(node)[0]
+
+    def _subtypes_of_parameterized_inheritance(
             self, node: tp.ParameterizedType) -> Set[tp.Type]:
         assert node.is_parameterized()
 
         subtypes = set()
         type_var_map = node.get_type_variable_assignments()
         node = self.get_type_by_name(node.name) or node.t_constructor
+        deps = {node}
         if node not in self.subtyping_graph:
-            return subtypes
+            return frozenset(subtypes), frozenset(deps)
 
         excluded_nodes = set()
         for k, v in nx.bfs_edges(self.subtyping_graph, node):
+            deps.add(v)
             if k in excluded_nodes:
                 # Type k has been excluded, so due to transitivity, we also
                 # exclude type v.
@@ -323,21 +450,32 @@ class APIGraph():
                 continue
             type_var_map = solution
             if v.is_type_constructor():
-                handler = self.get_instantiations_of_recursive_bound
-                inst_t = tu.instantiate_type_constructor(
-                    v, self.get_reg_types(), type_var_map=type_var_map,
-                    rec_bound_handler=handler)
+                if _uses_reg_types(v, type_var_map):
+                    deps.add(_REG_TYPES)
+                inst_t = self.instantiate_type_constructor(v, type_var_map)
                 if inst_t:
                     type_var_map.update(inst_t[1])
                     subtypes.add(inst_t[0])
             else:
                 subtypes.add(v)
-        return subtypes
+        return frozenset(subtypes), frozenset(deps)
 
-    def subtypes(self, node: tp.Type, include_self=True):
-        subtypes = {node} if include_self else set()
+    def subtypes_of_parameterized_inheritance(
+            self, node: tp.ParameterizedType) -> Set[tp.Type]:
+        return set(self._memoized(
+            self._subtypes_of_parameterized_inheritance, node)[0])
+
+    def _descendants(self, node: tp.Type):
+        if node not in self.subtyping_graph:
+            return frozenset(), frozenset([node])
+        descendants = frozenset(nx.descendants(self.subtyping_graph, node))
+        return descendants, descendants | {node}
+
+    def _subtypes(self, node: tp.Type):
+        # Return the subtypes of node (excluding node), along with the nodes
+        # of the subtyping graph that these subtypes depend on.
         if node.is_type_var():
-            return subtypes
+            return set(), ()
         if node.is_parameterized() and any(
                 t_arg.is_wildcard() or
                 not node.t_constructor.type_parameters[i].is_invariant()
@@ -345,35 +483,36 @@ class APIGraph():
         ):
             # Here the parameterized type either contains wildcards or the
             # type is derived from non-invariant type parameters.
-            subtypes.update(self.subtypes_of_parameterized(node))
-            return subtypes
+            return self._subtypes_of_parameterized(node)
 
         # Subtypes of simple classifiers.
         if not node.is_parameterized() and not node.is_type_constructor():
-            if node not in self.subtyping_graph:
-                return subtypes
-            subtypes.update(nx.descendants(self.subtyping_graph, node))
-            return subtypes
+            return self._memoized(self._descendants, node)
 
         if node.is_type_constructor():
             # FIXME type constructor subtypes
-            return subtypes
+            return set(), ()
+
+        return self._memoized(self._subtypes_of_parameterized_inheritance,
+                              node)
 
-        subtypes.update(self.subtypes_of_parameterized_inheritance(node))
+    def subtypes(self, node: tp.Type, include_self=True):
+        subtypes = {node} if include_self else set()
+        subtypes.update(self._subtypes(node)[0])
         return subtypes
 
-    def supertypes(self, node: tp.Type):
+    def _supertypes(self, node: tp.Type):
         supertypes = set()
         constraints = {}
         if node.is_parameterized():
             constraints.update(node.get_type_variable_assignments())
             node = self.get_type_by_name(node.name) or node.t_constructor
+        deps = {node}
         if node not in self.subtyping_graph:
-            return supertypes
-        if node not in self.subtyping_graph:
-            return supertypes
+            return frozenset(supertypes), frozenset(deps)
         for k, v, _ in nx.edge_dfs(self.subtyping_graph, node,
                                    orientation="reverse"):
+            deps.add(k)
             constraint = self.subtyping_graph[k][v].get("constraint") or {}
             if not constraint:
                 supertypes.add(k)
@@ -389,11 +528,16 @@ class APIGraph():
                     if type_k.is_contravariant() and t.is_covariant():
                         t = t.bound
                 constraints[type_k] = t
+            if _uses_reg_types(k, constraints):
+                deps.add(_REG_TYPES)
             handler = self.get_instantiations_of_recursive_bound
             supertypes.add(tu.instantiate_type_constructor(
                 k, {}, type_var_map=constraints,
                 rec_bound_handler=handler)[0])
-        return supertypes
+        return frozenset(supertypes), frozenset(deps)
+
+    def supertypes(self, node: tp.Type):
+        return set(self._memoized(self._supertypes, node)[0])
 
     def add_variable_node(self, name: str, var_type: tp.Type):
         source = Variable(name)
@@ -406,15 +550,21 @@ class APIGraph():
         self.api_graph.add_node(source)
         self.api_graph.add_node(target)
         self.api_graph.add_edge(source, target, **kwargs)
+        self._variables[source] = target
 
     def remove_variable_node(self, name: str):
         self.api_graph.remove_node(Variable(name))
+        self._variables.pop(Variable(name), None)
 
     def add_types(self, nodes: List[tp.Type]):
+        self._invalidate_memo(nodes)
+        self._available_types = {}
         self.subtyping_graph.add_nodes_from(nodes)
         self.types.extend(nodes)
 
     def remove_types(self, nodes: List[tp.Type]):
+        self._invalidate_memo(nodes)
+        self._available_types = {}
         self.subtyping_graph.remove_nodes_from(nodes)
         self.types = [t for t in self.types
                       if t not in nodes]
@@ -462,24 +612,82 @@ class APIGraph():
         # Find all source nodes that reach the selected target.
         source_nodes = self.source_nodes_of.get(target)
         if source_nodes is None:
-            ancestors = [(k, v) for k, v, _ in nx.edge_dfs(
-                self.api_graph, target, orientation="reverse")]
-            source_nodes = set(itertools.chain(*ancestors))
-            source_nodes = [
-                node
-                for node in source_nodes
-                if self.api_graph.in_degree(node) == 0
-            ]
-            self.source_nodes_of[target] = [s for s in source_nodes
-                                            if not isinstance(s, Variable)]
+            source_nodes = [s for s in self.source_index.get_sources(target)
+                            if s != target]
+            self.source_nodes_of[target] = source_nodes
+        if not self._variables:
+            return list(source_nodes), target
+        # Variables are sources too, and a node where a variable is attached
+        # is no longer a source.
+        var_targets = set(self._variables.values())
+        source_nodes = [s for s in source_nodes if s not in var_targets]
+        source_nodes.extend(
+            var for var, var_target in self._variables.items()
+            if self.source_index.reaches(var_target, target)
+        )
         return source_nodes, target
 
+    def _get_distances(self, target) -> Dict[APINode, int]:
+        """
+        Return the length of the shortest path from every node to the given
+        target. The distances are computed through a reverse BFS, and they
+        are memoized for the most recently used targets. Variable nodes are
+        excluded, because they come and go while generating programs.
+        """
+        distances = self._distances_to.get(target)
+        if distances is not None:
+            self._distances_to.move_to_end(target)
+            return distances
+        distances = {target: 0}
+        layer = [target]
+        while layer:
+            next_layer = []
+            for node in layer:
+                dist = distances[node] + 1
+                for pred in self.api_graph.predecessors(node):
+                    if pred in distances or isinstance(pred, Variable):
+                        continue
+                    distances[pred] = dist
+                    next_layer.append(pred)
+            layer = next_layer
+        self._distances_to[target] = distances
+        if len(self._distances_to) > self.MAX_CACHED_TARGETS:
+            self._distances_to.popitem(last=False)
+        return distances
+
+    def _get_shortest_paths(self, source, target):
+        """
+        Lazily enumerate the shortest paths from source to target in random
+        order. At every step, we move to a randomly chosen successor that is
+        one step closer to the target.
+        """
+        distances = self._get_distances(target)
+        dist = distances.get(source)
+        if dist is None:
+            # The source is a variable node.
+            succ_dists = [distances[n]
+                          for n in self.api_graph.successors(source)
+                          if n in distances]
+            if not succ_dists:
+                return
+            dist = min(succ_dists) + 1
+
+        def _extend(path, dist):
+            if dist == 0:
+                yield list(path)
+                return
+            candidates = [n for n in self.api_graph.successors(path[-1])
+                          if distances.get(n) == dist - 1]
+            for node in utils.random.shuffle(candidates):
+                path.append(node)
+                yield from _extend(path, dist - 1)
+                path.pop()
+
+        yield from _extend([source], dist)
+
     def _get_paths(self, source, target):
         if self.path_search_strategy == "shortest":
-            return utils.random.shuffle(
-                list(nx.all_shortest_paths(self.api_graph, source=source,
-                                           target=target))
-            )
+            return self._get_shortest_paths(source, target)
         return nx.shortest_simple_paths(self.api_graph, source=source,
                                         target=target)
 
@@ -555,7 +763,9 @@ class APIGraph():
         if t_constructor not in self.subtyping_graph:
             return possibles_types
 
-        subtypes = nx.descendants(self.subtyping_graph, t_constructor)
+        # Sort the subtypes, as some of them are instantiated randomly below.
+        subtypes = sorted(nx.descendants(self.subtyping_graph, t_constructor),
+                          key=str)
         for st in subtypes:
             # This is a quick and dirty solution. For every subtype of the
             # given bound, we compute its supertypes, and then we try to
@@ -758,18 +968,18 @@ class APIGraph():
             rec_type = rec_type.new(rec_type.type_parameters)
         return rec_type, out_type
 
-    def get_function_refs_of(self, etype: tp.Type,
-                             single: bool = False) -> List[Tuple[Method, dict]]:
-        func_type = self.get_functional_type_instantiated(etype)
-        if func_type is None:
-            return []
-        candidate_functions = []
-        api_components = (
-            utils.random.shuffle(list(self.api_graph.nodes()))
-            if single
-            else self.api_graph.nodes()
-        )
-        for api in api_components:
+    def _get_function_signatures(self) -> Dict[int, list]:
+        """
+        Return the signatures of the methods and constructors of the API
+        graph grouped by their number of parameters. A signature consists of
+        the receiver type, the return type, and the parameter types of the
+        API. Signatures are computed once, because the edges of methods and
+        constructors do not change during program generation.
+        """
+        if self._function_signatures is not None:
+            return self._function_signatures
+        self._function_signatures = defaultdict(list)
+        for api in self.api_graph.nodes():
             if not isinstance(api, (Method, Constructor)):
                 continue
             param_types = [
@@ -781,7 +991,25 @@ class APIGraph():
                 for param in api.parameters
             ]
             rec_type, out_type = self._get_receiver_and_ret_type_of_func(api)
-            match, sub = func_type.t_constructor.match_function(
+            self._function_signatures[len(param_types)].append(
+                (api, rec_type, out_type, param_types))
+        return self._function_signatures
+
+    def get_function_refs_of(self, etype: tp.Type,
+                             single: bool = False) -> List[Tuple[Method, dict]]:
+        func_type = self.get_functional_type_instantiated(etype)
+        if func_type is None:
+            return []
+        func_type_con = func_type.t_constructor
+        # An API matches the functional type only if it has the same number
+        # of parameters, so we do not unify the rest of the APIs.
+        nr_params = len(func_type_con.get_param_types(func_type))
+        signatures = self._get_function_signatures().get(nr_params, [])
+        if single:
+            signatures = utils.random.shuffle(list(signatures))
+        candidate_functions = []
+        for api, rec_type, out_type, param_types in signatures:
+            match, sub = func_type_con.match_function(
                 rec_type, out_type, param_types, func_type, self.bt_factory,
                 api.metadata
             )
@@ -820,8 +1048,11 @@ class APIGraph():
             type_param = tp.TypeParameter(utils.random.caps(
                 blacklist=blacklist), bound=bound)
             blacklist.append(type_param.name)
+            self._invalidate_memo([type_param, source] if bound
+                                  else [type_param])
             self.subtyping_graph.add_node(type_param)
             self.types.append(type_param)
+            self._available_types = {}
             if bound:
                 # Capture subtyping relationship in the subtyping graph.
                 self.subtyping_graph.add_edge(source, type_param, **kwargs)
@@ -838,11 +1069,7 @@ class APIGraph():
                 return None
             _, type_var_map = ret
         if receiver.is_type_constructor():
-            handler = self.get_instantiations_of_recursive_bound
-            inst = tu.instantiate_type_constructor(
-                receiver, self.get_reg_types(),
-                rec_bound_handler=handler
-            )
+            inst = self.instantiate_type_constructor(receiver)
             if not inst:
                 # We were unable to instantiate the given type
                 # constructor.
@@ -907,6 +1134,22 @@ class APIGraph():
         assert len(view) == 1
         return list(view)[0][1]
 
+    def get_signature(self, api) -> str:
+        """
+        Return the receiver, parameter, and output types of the given API as
+        a string that does not depend on the hashes of the types.
+        """
+        return "{}({}):{}".format(
+            self.get_input_type(api),
+            ", ".join(str(p.t) for p in getattr(api, "parameters", [])),
+            self.get_output_type(api))
+
+    def in_shard(self, api, shard: Tuple[int, int]) -> bool:
+        # APIs are sharded by their signatures, because duplicate encodings
+        # come (almost always) from APIs with the same signature.
+        index, shards = shard
+        return zlib.crc32(self.get_signature(api).encode()) % shards == index
+
     def get_concrete_output_type(self, api):
         out_type = self.get_output_type(api)
         if isinstance(api, Constructor):
@@ -921,18 +1164,35 @@ class APIGraph():
                                      for tpa in out_type.type_parameters])
         return out_type
 
-    def encode_api_components(self,
-                              matcher: Matcher = None) -> List[APIEncoding]:
+    def encode_api_components(self, matcher: Matcher = None,
+                              start: int = 0,
+                              shard: Tuple[int, int] = None
+                              ) -> List[APIEncoding]:
         api_components = (Field, Constructor, Method)
-        api_nodes = [
-            n
-            for n in self.api_graph.nodes()
-            if isinstance(n, api_components)
-        ]
+        # The order of the nodes of the graph depends on the hashes of the
+        # types (i.e., on PYTHONHASHSEED), so we sort them before shuffling.
+        # Otherwise, the same seed would give different orders in different
+        # processes (e.g., shards or resumed runs).
+        api_nodes = sorted(
+            (n for n in self.api_graph.nodes()
+             if isinstance(n, api_components)),
+            key=_get_node_key
+        )
         encodings = []
-        for node in utils.random.shuffle(api_nodes):
+        if self.seed is not None:
+            utils.random.seed(self.seed)
+        for i, node in enumerate(utils.random.shuffle(api_nodes)):
+            if i < start:
+                # Skip the APIs encoded before (e.g., by a resumed run).
+                continue
             if matcher and not matcher.match(node):
                 continue
+            if shard is not None and not self.in_shard(node, shard):
+                # Every API is encoded with its own seed, so skipping the
+                # APIs of the other shards does not change the encodings.
+                continue
+            if self.seed is not None:
+                utils.random.seed(self.seed, i)
             try:
                 self.generate_type_params()
                 ret = self.encode_receiver(node)
@@ -968,7 +1228,7 @@ class APIGraph():
                 yield APIEncoding(node, frozenset(receivers),
                                   parameters, frozenset(ret_types),
                                   type_var_map,
-                                  type_parameters)
+                                  type_parameters, i)
             except Exception:
                 self.remove_types(self.get_type_parameters())
         return encodings
@@ -71,16 +71,22 @@ class APIGraphBuilder(ABC):
                 else:
                     bound.supertypes = parsed_t.supertypes
 
+    def _parse_supertypes(self, super_types: List[str]) -> List[tp.Type]:
+        # Remove the duplicates, but keep the order of the docs. The order of
+        # a set of types depends on their hashes, i.e., on PYTHONHASHSEED,
+        # and it would end up in the order of the nodes of the graphs.
+        return list(dict.fromkeys(
+            self.parse_type(st, build_class_node=True)
+            for st in super_types
+        ))
+
     def build_topological_sort(self, docs: dict) -> List[str]:
         dep_graph = nx.DiGraph()
         for api_doc in docs.values():
             name = api_doc["name"]
             self.api_language = api_doc.get("language", self.api_language)
-            super_types = {
-                self.parse_type(st, build_class_node=True)
-                for st in api_doc.get("implements", []) + api_doc.get(
-                    "inherits", [])
-            }
+            super_types = self._parse_supertypes(
+                api_doc.get("implements", []) + api_doc.get("inherits", []))
             dep_graph.add_node(name)
             parent = api_doc.get("parent")
             if parent:
@@ -422,15 +428,13 @@ class APIGraphBuilder(ABC):
     def build_class_node(self, class_api: dict) -> tp.Type:
         self.parent_cls = self.class_nodes.get(class_api.get("parent"))
         self.build_tentative_type(class_api)
-        super_types = {
-            self.parse_type(st, build_class_node=True)
-            for st in class_api["implements"] + class_api["inherits"]
-        }
+        super_types = self._parse_supertypes(
+            class_api["implements"] + class_api["inherits"])
 
         if not super_types:
-            super_types.add(self.parse_type(ROOT_CLASSES[self.api_language]))
+            super_types.append(
+                self.parse_type(ROOT_CLASSES[self.api_language]))
         class_name = class_api["name"]
-        super_types = list(super_types)
         if self.parent_cls is None or not self.parent_cls.is_type_constructor():
             if class_api["type_parameters"]:
                 class_node = tp.TypeConstructor(
@@ -457,12 +461,10 @@ class APIGraphBuilder(ABC):
         return class_node
 
     def build_subtyping_relations(self, class_api: dict):
-        super_types = {
-            self.parse_type(st, build_class_node=True)
-            for st in class_api["implements"] + class_api["inherits"]
-        }
+        super_types = self._parse_supertypes(
+            class_api["implements"] + class_api["inherits"])
         if not super_types:
-            super_types.add(self.bt_factory.get_any_type())
+            super_types.append(self.bt_factory.get_any_type())
         for st in super_types:
             kwargs = {}
             source = st
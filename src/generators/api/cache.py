@@ -0,0 +1,111 @@
+"""
+This module implements an on-disk cache of built API graphs.
+
+Building the API graph of a large API (e.g., the standard library of Java)
+takes several seconds. So we store a snapshot of every built graph in a
+cache directory. A snapshot is identified by a hash of the contents of the
+API docs, the builder that processed them, and the configuration options
+that affect the build. Therefore, a snapshot is re-built only when one of
+these inputs changes.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Dict, NamedTuple
+
+import networkx as nx
+
+from src.config import cfg
+from src.generators.api.api_graph import APIGraph
+from src.generators.api.builder import APIGraphBuilder
+from src.generators.api.source_index import SourceIndex
+
+
+# Increase this number whenever the representation of the API graph changes,
+# so that we do not load snapshots created by older versions of thalia.
+CACHE_VERSION = 4
+
+
+class APIGraphSnapshot(NamedTuple):
+    api_graph: nx.DiGraph
+    subtyping_graph: nx.DiGraph
+    functional_types: dict
+    source_index: SourceIndex
+
+
+def read_doc_files(api_doc_path: str) -> Dict[str, bytes]:
+    docs = {}
+    # The order of the docs determines the order of the nodes of the graph.
+    for api_path in sorted(os.listdir(api_doc_path)):
+        with open(os.path.join(api_doc_path, api_path), 'rb') as f:
+            docs[api_path.replace(".json", "")] = f.read()
+    return docs
+
+
+def load_docs(doc_files: Dict[str, bytes]) -> Dict[str, dict]:
+    return {name: json.loads(content) for name, content in doc_files.items()}
+
+
+def compute_key(doc_files: Dict[str, bytes],
+                builder: APIGraphBuilder) -> str:
+    digest = hashlib.sha256()
+    header = (CACHE_VERSION, type(builder).__name__, builder.target_language,
+              cfg.prob.sam_coercion)
+    digest.update(repr(header).encode("utf-8"))
+    for name in sorted(doc_files):
+        digest.update(name.encode("utf-8"))
+        digest.update(hashlib.sha256(doc_files[name]).digest())
+    return digest.hexdigest()
+
+
+def load_snapshot(cache_dir: str, key: str) -> APIGraphSnapshot:
+    path = os.path.join(cache_dir, key + ".pickle")
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # The snapshot is either corrupted or incompatible with the current
+        # version of the code. We will re-build the graph.
+        return None
+
+
+def save_snapshot(cache_dir: str, key: str, snapshot: APIGraphSnapshot):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write the snapshot to a temporary file first, and then rename it, so
+    # that concurrent workers never observe a partially written snapshot.
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            pickle.dump(snapshot, out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(cache_dir, key + ".pickle"))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def build_api_graph(builder: APIGraphBuilder, api_doc_path: str,
+                    cache_dir: str = None) -> APIGraph:
+    """
+    Build the API graph of the docs found in `api_doc_path`.
+
+    If `cache_dir` is given, re-use the snapshot stored in this directory
+    (if any), or store a snapshot of the built graph for future runs.
+    """
+    doc_files = read_doc_files(api_doc_path)
+    if cache_dir is None:
+        return builder.build(load_docs(doc_files))
+    key = compute_key(doc_files, builder)
+    snapshot = load_snapshot(cache_dir, key)
+    if snapshot is None:
+        api_graph = builder.build(load_docs(doc_files))
+        save_snapshot(cache_dir, key, APIGraphSnapshot(
+            api_graph.api_graph, api_graph.subtyping_graph,
+            api_graph.functional_types, api_graph.source_index))
+        return api_graph
+    return APIGraph(snapshot.api_graph, snapshot.subtyping_graph,
+                    snapshot.functional_types, builder.bt_factory,
+                    source_index=snapshot.source_index, **builder.options)
@@ -136,7 +136,7 @@ class FaultInjection():
             subtypes = self.api_graph.subtypes_of_parameterized_inheritance(
                 etype)
             return (
-                utils.random.choice(list(subtypes))
+                utils.random.choice(sorted(subtypes, key=str))
                 if subtypes and utils.random.bool()
                 else etype
             )
@@ -0,0 +1,64 @@
+"""
+An index from every node of the API graph to the source nodes (i.e., the
+nodes without incoming edges) that reach it.
+
+The index is computed once over the condensation of the API graph. We visit
+the strongly connected components in topological order, and we assign every
+component the bitset of the anchor nodes that reach it. Anchors are the
+source nodes and the type nodes of the graph. Keeping the type nodes in the
+bitsets lets us answer reachability queries for the nodes where variables
+are attached to the graph (see `APIGraph.add_variable_node`).
+"""
+from typing import List
+
+import networkx as nx
+
+from src.ir import types as tp
+
+
+class SourceIndex():
+    def __init__(self, graph: nx.DiGraph):
+        self.anchors = []
+        self.bits = {}
+        self.masks = {}
+        # The bits of the anchors that are source nodes.
+        self.source_mask = 0
+        condensation = nx.condensation(graph)
+        comp_masks = {}
+        for comp in nx.topological_sort(condensation):
+            mask = 0
+            for pred in condensation.predecessors(comp):
+                mask |= comp_masks[pred]
+            members = condensation.nodes[comp]["members"]
+            for node in members:
+                is_source = graph.in_degree(node) == 0
+                if not is_source and not isinstance(node, tp.Type):
+                    continue
+                bit = 1 << len(self.anchors)
+                self.bits[node] = len(self.anchors)
+                self.anchors.append(node)
+                mask |= bit
+                if is_source:
+                    self.source_mask |= bit
+            comp_masks[comp] = mask
+            for node in members:
+                self.masks[node] = mask
+
+    def get_sources(self, node) -> List:
+        """Return the source nodes that reach the given node."""
+        mask = self.masks.get(node, 0) & self.source_mask
+        sources = []
+        while mask:
+            low = mask & -mask
+            sources.append(self.anchors[low.bit_length() - 1])
+            mask ^= low
+        return sources
+
+    def reaches(self, anchor, node) -> bool:
+        """Check whether there is a path from `anchor` to `node`."""
+        if anchor == node:
+            return True
+        bit = self.bits.get(anchor)
+        if bit is None:
+            return False
+        return bool(self.masks.get(node, 0) >> bit & 1)
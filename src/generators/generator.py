@@ -64,6 +64,14 @@ class Generator():
         self.ret_builtin_types = self.bt_factory.get_non_nothing_types()
         self.builtin_types = self.ret_builtin_types + \
             [self.bt_factory.get_void_type()]
+        # Index of the supertypes of the available types, which we update
+        # whenever we declare a class. We use it for finding subtypes.
+        self._type_index = tu.TypeIndex(self.builtin_types +
+                                        self.function_types)
+        # The attributes of every class (inherited ones included), indexed
+        # by their types, along with the names of the class and its
+        # supertypes. We drop them whenever we change any of these classes.
+        self._class_attributes = {}
 
         # In some case we need to use two namespaces. One for having access
         # to variables from scope, and one for adding new declarations.
@@ -92,6 +100,9 @@ class Generator():
         self.int_stream = iter(range(1, 10000))
         self._in_super_call = False
         self._blacklisted_classes: set = set()
+        self._type_index = tu.TypeIndex(self.builtin_types +
+                                        self.function_types)
+        self._class_attributes = {}
         if self.logger:
             self.logger.update_filename(program_id)
 
@@ -111,6 +122,8 @@ class Generator():
         and then it generates the main function.
         """
         self.context = context or Context()
+        for cls in self.context.get_classes(self.namespace).values():
+            self._type_index.add(cls.get_type())
         for _ in ut.random.range(cfg.limits.min_top_level,
                                  cfg.limits.max_top_level):
             self.gen_top_level_declaration()
@@ -412,6 +425,8 @@ class Generator():
             functions=[]
         )
         self._add_node_to_parent(ast.GLOBAL_NAMESPACE, cls)
+        self._type_index.add(cls.get_type())
+        self._drop_class_attributes(cls)
         self._blacklisted_classes.add(class_name)
 
         super_cls_info = self._select_superclass(
@@ -419,6 +434,8 @@ class Generator():
         if super_cls_info:
             cls.superclasses = [super_cls_info.super_inst]
             cls.supertypes = [c.class_type for c in cls.superclasses]
+            self._type_index.add(cls.get_type())
+            self._drop_class_attributes(cls)
         if not cls.is_interface():
             self.gen_class_fields(cls, super_cls_info, field_type)
 
@@ -544,6 +561,7 @@ class Generator():
     # Where
 
     def _add_node_to_class(self, cls, node):
+        self._drop_class_attributes(cls)
         if isinstance(node, ast.FunctionDeclaration):
             cls.functions.append(node)
             return
@@ -844,11 +862,27 @@ class Generator():
 
     ##### Expressions #####
 
-    def _get_class_attributes(self, class_decl, attr_name):
+    def _get_class_attributes(self, class_decl,
+                              attr_name) -> gu.AttributeIndex:
+        key = (class_decl.name, attr_name)
+        if key in self._class_attributes:
+            return self._class_attributes[key][1]
         class_decls = self.context.get_classes(self.namespace).values()
         if attr_name == 'functions':
-            return class_decl.get_callable_functions(class_decls)
-        return class_decl.get_all_fields(class_decls)
+            attributes = class_decl.get_callable_functions(class_decls)
+        else:
+            attributes = class_decl.get_all_fields(class_decls)
+        attributes = gu.AttributeIndex(attributes)
+        names = {t.name for t in class_decl.get_type().get_supertypes()}
+        self._class_attributes[key] = (names, attributes)
+        return attributes
+
+    def _drop_class_attributes(self, class_decl):
+        """Drop the attributes of a class and of the classes inheriting it."""
+        self._class_attributes = {
+            k: v for k, v in self._class_attributes.items()
+            if class_decl.name not in v[0]
+        }
 
     def generate_expr(self,
                       expr_type: tp.Type=None,
@@ -887,7 +921,8 @@ class Generator():
         expr_type = expr_type or self.select_type()
         if find_subtype:
             subtypes = tu.find_subtypes(expr_type, self.get_types(),
-                                        include_self=True, concrete_only=True)
+                                        include_self=True, concrete_only=True,
+                                        type_index=self._type_index)
             old_type = expr_type
             expr_type = ut.random.choice(subtypes)
             msg = "Found subtype of {}: {}".format(old_type, expr_type)
@@ -1260,7 +1295,8 @@ class Generator():
 
         if subtype:
             subtypes = tu.find_subtypes(etype, self.get_types(),
-                                        include_self=True, concrete_only=True)
+                                        include_self=True, concrete_only=True,
+                                        type_index=self._type_index)
             true_type = ut.random.choice(subtypes)
             false_type = ut.random.choice(subtypes)
             tmp_t = ut.random.choice(subtypes)
@@ -1341,7 +1377,8 @@ class Generator():
         var = ut.random.choice(final_vars)
         var_type = var.get_type()
         subtypes = tu.find_subtypes(var_type, self.get_types(),
-                                    include_self=False, concrete_only=True)
+                                    include_self=False, concrete_only=True,
+                                    type_index=self._type_index)
         subtypes = self._filter_subtypes(subtypes, var_type)
         if not subtypes:
             return self.generate_expr(expr_type, only_leaves=True,
@@ -2385,7 +2422,9 @@ class Generator():
                           self.function_type):
                 continue
             cls, type_map_var = self._get_class(var_type)
-            for attr in self._get_class_attributes(cls, attr_name):
+            attributes = self._get_class_attributes(cls, attr_name)
+            for attr in (attributes.attributes if func_ref or signature
+                         else attributes.get_candidates(etype)):
                 attr_type = tp.substitute_type(
                     attr.get_type(), type_map_var)
                 if attr_type == self.bt_factory.get_void_type():
@@ -2779,7 +2818,9 @@ class Generator():
 
         class_decls = []
         for c in self.context.get_classes(self.namespace).values():
-            for attr in self._get_class_attributes(c, attr_name):
+            attributes = self._get_class_attributes(c, attr_name)
+            for attr in (attributes.attributes if signature
+                         else attributes.get_candidates(etype)):
                 attr_type = attr.get_type()
                 if not attr_type:
                     continue
@@ -2,6 +2,8 @@
 This file includes utility functions for the generator module.
 """
 from dataclasses import dataclass
+from heapq import merge
+from typing import Iterable, List
 
 from src import utils as ut
 from src.ir import ast
@@ -63,6 +65,62 @@ class AttrReceiverInfo:
     attr_inst: tu.TypeVarMap
 
 
+class AttributeIndex:
+    """
+    The attributes (either fields or functions) of a class, indexed by the
+    keys of the supertypes of their types (see `type_utils.TypeIndex`).
+
+    An attribute whose type is (or is assignable to) a given type must have
+    a supertype with the key of that type, unless its type contains type
+    variables, or its type follows its own subtyping / assignability rules
+    (e.g., Nothing, or Short in Java). Such attributes, as well as
+    parameterized functions, are candidates for every type.
+    """
+
+    # The implementations of `is_assignable()` that imply `is_subtype()`.
+    REGULAR_ASSIGNABILITY = {
+        tp.Type.is_assignable,
+        tp.ParameterizedType.is_assignable,
+    }
+
+    def __init__(self, attributes: Iterable[ast.Declaration]):
+        self.attributes = list(attributes)
+        # key -> positions of the attributes
+        self._positions = {}
+        # positions of the attributes that can match any type
+        self._unindexed = []
+        for i, attr in enumerate(self.attributes):
+            keys = self._get_supertype_keys(attr)
+            if keys is None:
+                self._unindexed.append(i)
+                continue
+            for key in keys:
+                self._positions.setdefault(key, []).append(i)
+
+    @staticmethod
+    def _get_supertype_keys(attr):
+        attr_type = attr.get_type()
+        if not attr_type or attr_type.has_type_variables() or \
+                getattr(attr, 'type_parameters', None) or \
+                type(attr_type).is_assignable not in \
+                AttributeIndex.REGULAR_ASSIGNABILITY:
+            return None
+        supertypes = attr_type.get_supertypes()
+        if any(type(st).is_subtype not in tu.TypeIndex.REGULAR_SUBTYPING
+               for st in supertypes):
+            return None
+        return {tu.TypeIndex.get_key(st) for st in supertypes}
+
+    def get_candidates(self, etype: tp.Type) -> List[ast.Declaration]:
+        """
+        Get the attributes whose type may be `etype` or a subtype of it,
+        in the order of `self.attributes`.
+        """
+        positions = self._positions.get(tu.TypeIndex.get_key(etype), [])
+        return [self.attributes[i]
+                for i in merge(positions, self._unindexed)]
+
+
 ### Utility functions ###
 
 # NOTE maybe me can create an enum for class types
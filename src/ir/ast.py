@@ -1,6 +1,6 @@
 # pylint: disable=dangerous-default-value
 from typing import List, Set, Union
-from copy import deepcopy
+from copy import copy, deepcopy
 
 import src.ir.type_utils as tu
 import src.ir.types as types
@@ -26,6 +26,31 @@ def check_default_eq(first, second):
         return second is None
 
 
+def copy_nodes(value):
+    """
+    Copy the AST nodes of the given tree, sharing its types.
+
+    Generated programs share types with each other (e.g., the types of the
+    API graph). Hence, types are never modified in place once they are part
+    of a program. A node that needs a modified type gets a copy of the type
+    instead (see `New.omit_types`).
+    """
+    if isinstance(value, types.Type) or not isinstance(
+            value, (Node, list, tuple, dict)):
+        return value
+    if isinstance(value, list):
+        return [copy_nodes(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(copy_nodes(v) for v in value)
+    if isinstance(value, dict):
+        return value.__class__(
+            (k, copy_nodes(v)) for k, v in value.items())
+    new_node = value.__class__.__new__(value.__class__)
+    new_node.__dict__.update(
+        (k, copy_nodes(v)) for k, v in value.__dict__.items())
+    return new_node
+
+
 class Expr(Node):
 
     def has_variable(self) -> bool:
@@ -69,7 +94,7 @@ class Program(Node):
         return new_types
 
     def update_declarations(self, decls):
-        self.context._context[GLOBAL_NAMESPACE]['decls'] = decls
+        self.context.update_declarations(GLOBAL_NAMESPACE, decls)
 
     def _add_function(self, namespace, func):
         self.context.add_func(namespace, func.name, func)
@@ -676,18 +701,21 @@ class ClassDeclaration(Declaration):
 
         parent_funcs = class_decl.get_callable_functions(class_decls)
 
-        # substitute type variables in parent's functions
+        # substitute type variables in parent's functions. Only the signature
+        # of the inherited functions is substituted, so the copies share the
+        # rest of the declaration (e.g., the body) with the parent's
+        # functions.
         for f in parent_funcs:
-            new_f = deepcopy(f)
+            new_f = copy(f)
             params = []
             for p in f.params:
-                new_p = deepcopy(p)
+                new_p = copy(p)
                 new_p.param_type = types.substitute_type(p.get_type(),
                                                          type_var_map)
                 params.append(new_p)
             type_params = []
             for t_param in f.type_parameters:
-                new_tparam = deepcopy(t_param)
+                new_tparam = copy(t_param)
                 if new_tparam.bound:
                     new_tparam.bound = types.substitute_type(t_param.bound,
                                                              type_var_map)
@@ -729,7 +757,7 @@ class ClassDeclaration(Declaration):
             if f.name in field_names:
                 # We override this field in the current class
                 continue
-            new_f = deepcopy(f)
+            new_f = copy(f)
             new_f.field_type = types.substitute_type(f.get_type(),
                                                      type_var_map)
             fields.add(new_f)
@@ -766,10 +794,12 @@ class ClassDeclaration(Declaration):
         funcs = class_decl.get_abstract_functions(class_decls)
         implemented_funcs = {f.name for f in self.functions
                              if f.body is not None}
+        # The copies get new params, type parameters, and return types below,
+        # and abstract functions have no body, so a shallow copy is enough.
         for f in funcs:
             if f.name in implemented_funcs:
                 continue
-            new_f = deepcopy(f)
+            new_f = copy(f)
             params = []
             for p in f.params:
                 new_p = deepcopy(p)
@@ -1263,6 +1293,7 @@ class New(Expr):
 
     def omit_types(self):
         if self.class_type.is_parameterized():
+            self.class_type = copy(self.class_type)
             self.class_type.can_infer_type_args = True
 
     def __str__(self):
@@ -5,13 +5,36 @@ from src.ir import ast
 
 
 class Context():
+    # The views computed by `_get_declarations`, keyed by the kind of the
+    # declarations (e.g., 'vars'). The views of a kind are dropped whenever
+    # a declaration of that kind is added or removed. The views are computed
+    # lazily, and they are never pickled. The nested namespaces found by
+    # `_get_nested_namespaces` are kept under 'namespaces', and they are
+    # dropped along with every other view when a function or a class changes.
+    _views = None
 
     def __init__(self):
         self._context = {}
         # A lookup from declarations to namespaces
         self._namespaces = {}
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_views', None)
+        return state
+
+    def _drop_views(self, entity=None):
+        if not self._views:
+            return
+        if entity is None or entity in ('funcs', 'classes'):
+            # Functions and classes define the namespaces that the glob
+            # views of every kind of declarations go through.
+            self._views = None
+        else:
+            self._views.pop(entity, None)
+
     def _add_entity(self, namespace, entity, name, value):
+        self._drop_views(entity)
         if namespace in self._context:
             self._context[namespace][entity][name] = value
         else:
@@ -29,6 +52,7 @@ class Context():
     def _remove_entity(self, namespace, entity, name):
         if namespace not in self._context:
             return
+        self._drop_views(entity)
         if name in self._context[namespace][entity]:
             decl = self._context[namespace][entity][name]
             if decl in self._namespaces:
@@ -85,6 +109,22 @@ class Context():
     def _get_declarations(self, namespace, decl_type, only_current, glob, none):
         len_namespace = len(namespace)
         assert len_namespace >= 1
+        if none and not glob and (len_namespace == 1 or only_current):
+            return self._context.get(namespace, {}).get(decl_type, {})
+        if self._views is None:
+            self._views = {}
+        views = self._views.setdefault(decl_type, {})
+        key = (namespace, only_current, glob, none)
+        decls = views.get(key)
+        if decls is None:
+            decls = self._compute_declarations(
+                namespace, decl_type, only_current, glob, none)
+            views[key] = decls
+        return decls
+
+    def _compute_declarations(self, namespace, decl_type, only_current, glob,
+                              none):
+        len_namespace = len(namespace)
         decls = {}
         if glob:
             decls = self._get_declarations_glob(namespace, decl_type)
@@ -110,24 +150,34 @@ class Context():
                             for cname in self.get_classes(namespace, True, none=none)]
         return func_namespaces + class_namespaces
 
+    def _get_nested_namespaces(self, namespace):
+        """Return the given namespace and all the namespaces of the functions
+        and classes nested in it."""
+        if self._views is None:
+            self._views = {}
+        views = self._views.setdefault('namespaces', {})
+        namespaces = views.get(namespace)
+        if namespaces is None:
+            namespaces = []
+            stack = [namespace]
+            while stack:
+                ns = stack.pop()
+                namespaces.append(ns)
+                stack.extend(self.find_namespaces(ns, none=False))
+            views[namespace] = namespaces
+        return namespaces
+
     def get_namespaces_decls(self, namespace, name, decl_type, glob=True):
         """Return a set of tuples of namespace, decl. Note that namespace
         includes the name of the decl.
         """
         namespaces_decls = set()  # Set of tuples of namespace, decl
         if glob:
-            namespaces = [(namespace[0],)]
-        else:
-            namespaces = [namespace]
-        while namespaces:
-            namespace = namespaces.pop()
-            decls = self._context.get(namespace, {}).get(decl_type)
-            if decls is not None:
-                for decl_name, decl in decls.items():
-                    if decl_name == name:
-                        ns = namespace + (name,)
-                        namespaces_decls.add((ns, decl))
-            namespaces.extend(self.find_namespaces(namespace, none=False))
+            namespace = (namespace[0],)
+        for ns in self._get_nested_namespaces(namespace):
+            decls = self._context.get(ns, {}).get(decl_type)
+            if decls is not None and name in decls:
+                namespaces_decls.add((ns + (name,), decls[name]))
         return namespaces_decls
 
     def get_decl(self, namespace, name):
@@ -159,6 +209,12 @@ class Context():
     def remove_namespace(self, namespace):
         if namespace in self._context:
             self._context.pop(namespace)
+            self._drop_views()
+
+    def update_declarations(self, namespace, decls):
+        """Replace the declarations of the given namespace."""
+        self._context[namespace]['decls'] = decls
+        self._drop_views('decls')
 
     def get_declarations_in(self, namespace):
         decls = {}
@@ -0,0 +1,289 @@
+"""
+A versioned encoding of the IR (see `src/ir/ast.py` and `src/ir/types.py`).
+
+A program is encoded as a stream of JSON lines. The first line is a header
+that holds the version of the format. Every subsequent line is a chunk that
+extends the tables of the stream with the strings, the shapes (i.e., an IR
+class along with the names of its fields), and the objects encountered since
+the previous chunk. The last line holds the encoded root object.
+
+* Strings and shapes are interned, so every name is stored once per stream.
+* IR objects and mutable containers (lists, dicts, sets) are stored once,
+  and they are referenced by their index in the stream. Hence, shared
+  objects remain shared after decoding, and cycles (e.g., a type parameter
+  whose bound refers to the type parameter itself) are supported.
+* Classes are identified by their names in the IR (e.g., "ast.FunctionCall"
+  or "java.IntegerType") instead of their module paths, and objects are
+  restored field by field, without calling their constructors.
+
+Values are encoded as follows: None, booleans, and floats are stored as is,
+an integer is a reference to an object of the stream, and everything else is
+a list whose first element is one of the `_STR`, `_INT`, ... codes below.
+"""
+import inspect
+import json
+from collections import OrderedDict
+from typing import IO
+
+from src import utils
+from src.ir import BUILTIN_FACTORIES
+from src.ir import (ast, builtins, context, types, groovy_types,
+                    java_types, kotlin_types, scala_types)
+
+
+FORMAT = "thalia-ir"
+VERSION = 1
+# Number of objects per chunk.
+CHUNK_SIZE = 4096
+MAGIC = ('{"format": "' + FORMAT + '"').encode()
+
+_MODULES = OrderedDict([
+    ("ast", ast),
+    ("types", types),
+    ("context", context),
+    ("builtins", builtins),
+    ("groovy", groovy_types),
+    ("java", java_types),
+    ("kotlin", kotlin_types),
+    ("scala", scala_types),
+])
+
+# Codes of the encoded values.
+_STR, _INT, _TUPLE, _FROZENSET, _VARIANCE, _FACTORY = range(6)
+# Shapes of the mutable containers.
+_LIST, _DICT, _ODICT, _SET = "list", "dict", "odict", "set"
+_CONTAINERS = {list: _LIST, dict: _DICT, OrderedDict: _ODICT, set: _SET}
+
+
+class SerializationError(Exception):
+    pass
+
+
+def _get_class_tags():
+    tags = {}
+    for prefix, module in _MODULES.items():
+        for name, cls in vars(module).items():
+            if inspect.isclass(cls) and cls.__module__ == module.__name__:
+                tags[cls] = prefix + "." + name
+    return tags
+
+
+_CLASS_TAGS = _get_class_tags()
+_TAG_CLASSES = {tag: cls for cls, tag in _CLASS_TAGS.items()}
+_FACTORY_LANGUAGES = {type(f): lang for lang, f in BUILTIN_FACTORIES.items()}
+
+
+class Encoder():
+    def __init__(self, out: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.out = out
+        self.chunk_size = chunk_size
+        self.strings = {}
+        self.shapes = {}
+        self.objects = {}
+        # The objects whose fields have not been encoded yet.
+        self.queue = []
+        self.chunk = None
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self.chunk = {"strings": [], "shapes": [], "objects": []}
+
+    def _flush(self):
+        if any(self.chunk.values()):
+            self.out.write(json.dumps(self.chunk, separators=(',', ':')))
+            self.out.write("\n")
+        self._new_chunk()
+
+    def _string(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+            self.chunk["strings"].append(value)
+        return index
+
+    def _shape(self, shape):
+        index = self.shapes.get(shape)
+        if index is None:
+            index = len(self.shapes)
+            self.shapes[shape] = index
+            self.chunk["shapes"].append(list(shape))
+        return index
+
+    def value(self, obj):
+        # Most values are references to objects that we have already seen.
+        index = self.objects.get(id(obj))
+        if index is not None:
+            return index
+        cls = type(obj)
+        if cls is str:
+            return [_STR, self._string(obj)]
+        if obj is None or cls is bool or cls is float:
+            return obj
+        if cls is types.Variance:
+            return [_VARIANCE, obj.value]
+        if cls in _FACTORY_LANGUAGES:
+            return [_FACTORY, self._string(_FACTORY_LANGUAGES[cls])]
+        if cls in _CLASS_TAGS or cls in _CONTAINERS:
+            index = len(self.queue)
+            self.objects[id(obj)] = index
+            # The queue keeps the object alive, so its id is not re-used.
+            self.queue.append(obj)
+            return index
+        if cls is int:
+            return [_INT, obj]
+        if cls is tuple:
+            return [_TUPLE] + [self.value(o) for o in obj]
+        if cls is frozenset:
+            return [_FROZENSET] + [self.value(o) for o in _sorted(obj)]
+        raise SerializationError("Cannot encode objects of " + str(cls))
+
+    def _record(self, obj):
+        value = self.value
+        cls = type(obj)
+        kind = _CONTAINERS.get(cls)
+        if kind is None:
+            state = obj.__dict__
+            if isinstance(obj, (types.CachedHash, context.Context)):
+                state = obj.__getstate__()
+            record = [self._shape((_CLASS_TAGS[cls],) + tuple(state))]
+            record.extend([value(v) for v in state.values()])
+            return record
+        record = [self._shape((kind,))]
+        if kind is _LIST:
+            record.extend([value(v) for v in obj])
+        elif kind is _SET:
+            record.extend([value(v) for v in _sorted(obj)])
+        else:
+            for key, val in obj.items():
+                record.append(value(key))
+                record.append(value(val))
+        return record
+
+    def encode(self, obj):
+        self.out.write(json.dumps({"format": FORMAT, "version": VERSION}))
+        self.out.write("\n")
+        root = self.value(obj)
+        done = 0
+        while done < len(self.queue):
+            # Encoding an object may add new objects to the queue.
+            end = min(len(self.queue), done + self.chunk_size)
+            self.chunk["objects"].extend(
+                [self._record(o) for o in self.queue[done:end]])
+            done = end
+            self._flush()
+        self.out.write(json.dumps({"root": root}, separators=(',', ':')))
+        self.out.write("\n")
+
+
+def _sorted(values):
+    # Sets are encoded in the order of the string representations of their
+    # elements (e.g., the names of types), which does not depend on hashes.
+    # Elements with the same representation keep the order of the set.
+    return sorted(values, key=lambda v: (type(v).__name__, str(v)))
+
+
+class Decoder():
+    def __init__(self):
+        self.strings = []
+        self.shapes = []
+        self.objects = []
+        self.records = []
+
+    def _create(self, record):
+        shape = self.shapes[record[0]]
+        tag = shape[0]
+        if tag == _LIST:
+            return []
+        if tag == _DICT:
+            return {}
+        if tag == _ODICT:
+            return OrderedDict()
+        if tag == _SET:
+            return set()
+        cls = _TAG_CLASSES.get(tag)
+        if cls is None:
+            raise SerializationError("Unknown IR class " + tag)
+        return cls.__new__(cls)
+
+    def add_chunk(self, chunk):
+        self.strings.extend(chunk["strings"])
+        self.shapes.extend(chunk["shapes"])
+        for record in chunk["objects"]:
+            self.objects.append(self._create(record))
+            self.records.append(record)
+
+    def value(self, value):
+        if type(value) is int:
+            return self.objects[value]
+        if type(value) is not list:
+            return value
+        code = value[0]
+        if code == _STR:
+            return self.strings[value[1]]
+        if code == _INT:
+            return value[1]
+        if code == _TUPLE:
+            return tuple(self.value(v) for v in value[1:])
+        if code == _FROZENSET:
+            return frozenset(self.value(v) for v in value[1:])
+        if code == _VARIANCE:
+            return types.Variance(value[1])
+        if code == _FACTORY:
+            return BUILTIN_FACTORIES[self.strings[value[1]]]
+        raise SerializationError("Unknown value code " + str(code))
+
+    def decode(self, root):
+        # Restore the fields of the IR objects first, then the lists, and
+        # finally the dicts and the sets, because the hashes of their keys
+        # may depend on the fields and the lists of the IR objects.
+        hashed = []
+        for obj, record in zip(self.objects, self.records):
+            shape = self.shapes[record[0]]
+            tag = shape[0]
+            if tag == _LIST:
+                obj.extend(self.value(v) for v in record[1:])
+            elif tag in (_DICT, _ODICT, _SET):
+                hashed.append((obj, tag, record))
+            else:
+                obj.__dict__.update(zip(
+                    shape[1:], (self.value(v) for v in record[1:])))
+        for obj, tag, record in hashed:
+            values = [self.value(v) for v in record[1:]]
+            if tag == _SET:
+                obj.update(values)
+            else:
+                obj.update(zip(values[::2], values[1::2]))
+        return self.value(root)
+
+
+def is_encoded(inp: IO[bytes]) -> bool:
+    """Check whether the given binary stream holds an encoded IR object."""
+    pos = inp.tell()
+    header = inp.read(len(MAGIC))
+    inp.seek(pos)
+    return header == MAGIC
+
+
+def dump(obj, out: IO[str], chunk_size: int = CHUNK_SIZE):
+    """Encode the given IR object into the given text stream."""
+    Encoder(out, chunk_size).encode(obj)
+
+
+def load(inp: IO[str]):
+    """Decode an IR object from the given text stream."""
+    header = json.loads(inp.readline())
+    if header.get("format") != FORMAT:
+        raise SerializationError("Not an encoded IR object")
+    if header.get("version") != VERSION:
+        raise SerializationError(
+            "Unsupported version {} of the IR encoding (expected {})".format(
+                header.get("version"), VERSION))
+    decoder = Decoder()
+    with utils.gc_disabled():
+        for line in inp:
+            chunk = json.loads(line)
+            if "root" in chunk:
+                return decoder.decode(chunk["root"])
+            decoder.add_chunk(chunk)
+    raise SerializationError("Truncated IR encoding")
@@ -107,7 +107,8 @@ def _find_candidate_type_args(t_param: tp.TypeParameter,
                               types,
                               get_subtypes,
                               type_var_map={},
-                              ignore_variance=False):
+                              ignore_variance=False,
+                              type_index=None):
 
     bound = None
     if t_param.bound:
@@ -132,11 +133,13 @@ def _find_candidate_type_args(t_param: tp.TypeParameter,
     elif t_param.is_covariant():
         t_args = _find_types(
             base_targ, types,
-            get_subtypes, True, bound, concrete_only=True)
+            get_subtypes, True, bound, concrete_only=True,
+            type_index=type_index)
     else:
         t_args = _find_types(
             base_targ, types,
-            not get_subtypes, True, bound, concrete_only=True)
+            not get_subtypes, True, bound, concrete_only=True,
+            type_index=type_index)
 
     if not base_targ.is_wildcard() or ignore_variance:
         return t_args
@@ -146,7 +149,7 @@ def _find_candidate_type_args(t_param: tp.TypeParameter,
             new_types.extend(_find_types(
                 base_targ.bound,
                 types, get_subtypes, True, bound,
-                concrete_only=True))
+                concrete_only=True, type_index=type_index))
         new_types.extend([tp.WildCardType(t, tp.Covariant)
                           for t in new_types])
     elif base_targ.is_contravariant():
@@ -154,7 +157,8 @@ def _find_candidate_type_args(t_param: tp.TypeParameter,
         if get_subtypes:
             new_types.extend(_find_types(
                 base_targ.bound, types,
-                not get_subtypes, True, bound, concrete_only=True))
+                not get_subtypes, True, bound, concrete_only=True,
+                type_index=type_index))
     else:
         new_types = []
     t_args.extend(new_types)
@@ -162,7 +166,7 @@ def _find_candidate_type_args(t_param: tp.TypeParameter,
 
 
 def _construct_related_types(etype: tp.ParameterizedType, types, get_subtypes,
-                             ignore_variance=False):
+                             ignore_variance=False, type_index=None):
     type_var_map = OrderedDict()
     if etype.name == 'Array':
         types = [t for t in types
@@ -225,7 +229,8 @@ def _construct_related_types(etype: tp.ParameterizedType, types, get_subtypes,
             t_args = _find_candidate_type_args(t_param, etype.type_args[i],
                                                types, get_subtypes,
                                                type_var_map,
-                                               ignore_variance)
+                                               ignore_variance,
+                                               type_index)
             if not t_args:
                 # We were not able to construct a subtype of the given
                 # parameterized type. Therefore, we give back the given
@@ -245,8 +250,73 @@ def to_type(stype, types):
     return stype
 
 
+class TypeIndex():
+    """
+    Index the transitive supertypes of a set of types, so that finding the
+    subtypes of a type can skip most of the types of the set without
+    checking whether they are subtypes.
+
+    A type can only be equal to another type (or a parameterized type can
+    only be subtype of another one) if they have the same key, i.e., the
+    same name, or the same class in the case of built-in types. Types are
+    indexed by their name, so adding a type with the name of an indexed
+    type replaces the indexed type. Built-in types, which may share their
+    names and classes (e.g., int and Integer in Java), are indexed by
+    themselves.
+
+    Types whose subtyping relation is not determined by their supertypes
+    (e.g., type parameters and Nothing) are never indexed.
+    """
+
+    # The implementations of `is_subtype()` that follow the supertypes.
+    REGULAR_SUBTYPING = {
+        tp.Builtin.is_subtype,
+        tp.SimpleClassifier.is_subtype,
+        tp.TypeConstructor.is_subtype,
+        tp.ParameterizedType.is_subtype,
+    }
+
+    def __init__(self, types: Iterable[tp.Type] = ()):
+        # index entry -> keys of the supertypes
+        self._supertypes = {}
+        for t in types:
+            self.add(t)
+
+    @staticmethod
+    def get_key(t: tp.Type):
+        return t.__class__ if isinstance(t, tp.Builtin) else t.name
+
+    @staticmethod
+    def _get_entry(t: tp.Type):
+        return t if isinstance(t, tp.Builtin) else t.name
+
+    def add(self, t: tp.Type):
+        self.remove(t)
+        supertypes = t.get_supertypes()
+        if any(type(st).is_subtype not in self.REGULAR_SUBTYPING
+               for st in supertypes):
+            return
+        entry = self._get_entry(t)
+        self._supertypes[entry] = {self.get_key(st) for st in supertypes}
+
+    def remove(self, t: tp.Type):
+        entry = self._get_entry(t)
+        self._supertypes.pop(entry, None)
+
+    def may_be_subtype(self, t: tp.Type, etype_key) -> bool:
+        """
+        Check whether `t` may be a subtype of the type with key `etype_key`.
+        It is False only if `t` is indexed and none of its supertypes has
+        this key.
+        """
+        supertypes = self._supertypes.get(self._get_entry(t))
+        return (supertypes is None or etype_key in supertypes or
+                type(t).is_subtype not in self.REGULAR_SUBTYPING)
+
+
 def _find_types(etype, types, get_subtypes, include_self, bound=None,
-                concrete_only=False, ignore_variance=False):
+                concrete_only=False, ignore_variance=False,
+                type_index: TypeIndex = None):
 
     # Otherwise, if we want to find the supertypes of a given type, `bound`
     # is interpreted a greatest bound.
@@ -256,10 +326,15 @@ def _find_types(etype, types, get_subtypes, include_self, bound=None,
     else:
         # Find subtypes
         t_set = set()
+        etype_key = (type_index.get_key(etype)
+                     if type_index is not None else None)
         for c in types:
             selected_type = c.get_type() if hasattr(c, 'get_type') else c
             if etype == selected_type:
                 continue
+            if type_index is not None and not type_index.may_be_subtype(
+                    selected_type, etype_key):
+                continue
             if selected_type.is_subtype(etype):
                 t_set.add(selected_type)
                 continue
@@ -267,7 +342,7 @@ def _find_types(etype, types, get_subtypes, include_self, bound=None,
     if isinstance(etype, tp.ParameterizedType):
         t_set.add(_construct_related_types(
             etype, types, get_subtypes,
-            ignore_variance=ignore_variance))
+            ignore_variance=ignore_variance, type_index=type_index))
     if include_self:
         t_set.add(etype)
     else:
@@ -280,10 +355,11 @@ def _find_types(etype, types, get_subtypes, include_self, bound=None,
 
 def find_subtypes(etype, types, include_self=False, bound=None,
                   concrete_only=False,
-                  ignore_variance=False):
+                  ignore_variance=False,
+                  type_index: TypeIndex = None):
     return _find_types(etype, types, get_subtypes=True,
                        include_self=include_self, concrete_only=concrete_only,
-                       ignore_variance=ignore_variance)
+                       ignore_variance=ignore_variance, type_index=type_index)
 
 
 def find_supertypes(etype, types, include_self=False, bound=None,
@@ -638,7 +714,8 @@ def _find_candidate_types_for_bound(
         ]
 ) -> List[tp.Type]:
     if type_param.has_recursive_bound(cfg.bt_factory) and rec_bound_handler:
-        return list(rec_bound_handler(type_param, type_var_map, types))
+        return sorted(rec_bound_handler(type_param, type_var_map, types),
+                      key=str)
 
     if type_param.bound.has_type_variables():
         bound = tp.substitute_type(type_param.bound, type_var_map)
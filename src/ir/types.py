@@ -13,8 +13,32 @@ class Variance(object):
     COVARIANT = 1
     CONTRAVARIANT = 2
 
-    def __init__(self, value):
-        self.value = value
+    # Variances are interned: there is a single instance per value, so
+    # that hashing and comparing variances is cheap.
+    __slots__ = ('value',)
+    _instances = {}
+
+    def __new__(cls, value=None):
+        if value is None:
+            # Pickles written before variances were interned create the
+            # instance without a value, and restore it by __setstate__.
+            return super().__new__(cls)
+        variance = cls._instances.get(value)
+        if variance is None:
+            variance = super().__new__(cls)
+            variance.value = value
+            cls._instances[value] = variance
+        return variance
+
+    def __reduce__(self):
+        return (Variance, (self.value,))
+
+    def __setstate__(self, state):
+        # The state of the old pickles is the __dict__ of the instance, e.g.,
+        # {'value': 1}.
+        if isinstance(state, tuple):
+            state = state[1]
+        self.value = state['value']
 
     def variance_to_str(self):
         if self.value == 1:
@@ -33,16 +57,15 @@ class Variance(object):
         return self.value == 0
 
     def __hash__(self):
-        return hash(self.value)
+        return self.value
 
     def __str__(self):
         return str(self.value)
 
     def __eq__(self, other):
-        return (
-            self.__class__ == other.__class__ and
-            self.value == other.value
-        )
+        # Variances loaded from old pickles are not interned.
+        return self is other or (
+            other.__class__ is Variance and self.value == other.value)
 
 
 Invariant = Variance(Variance.INVARIANT)
@@ -118,6 +141,34 @@ class Type(Node):
         return str(self.name)
 
 
+class CachedHash():
+    """
+    Mixin for types that cache their hash.
+
+    The hash of such a type must depend only on the attributes listed in
+    `hash_attrs`. The cached hash is dropped whenever one of these attributes
+    is re-assigned (e.g., when a type parameter is renamed).
+    """
+    hash_attrs = ()
+    _hash = None
+
+    def __setattr__(self, name, value):
+        if name in self.hash_attrs:
+            self.__dict__.pop('_hash', None)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        # Hashes of strings differ across processes, so we never pickle
+        # the cached hash.
+        state = self.__dict__.copy()
+        state.pop('_hash', None)
+        return state
+
+    def cache_hash(self, value):
+        self.__dict__['_hash'] = value
+        return value
+
+
 class AbstractType(Type):
     def is_subtype(self, other):
         raise TypeError("You cannot call 'is_subtype()' in an AbstractType")
@@ -231,7 +282,8 @@ class SimpleClassifier(Classifier):
         )
 
 
-class TypeParameter(AbstractType):
+class TypeParameter(CachedHash, AbstractType):
+    hash_attrs = ('name', 'variance')
 
     def __init__(self, name: str, variance=None, bound: Type = None):
         super().__init__(name)
@@ -309,7 +361,7 @@ class TypeParameter(AbstractType):
                 self.bound == other.bound)
 
     def __hash__(self):
-        return hash((self.name, self.variance))
+        return self._hash or self.cache_hash(hash((self.name, self.variance)))
 
     def __str__(self):
         return "{}{}{}".format(
@@ -320,7 +372,9 @@ class TypeParameter(AbstractType):
         )
 
 
-class WildCardType(Type):
+class WildCardType(CachedHash, Type):
+    hash_attrs = ('name', 'variance')
+
     def __init__(self, bound=None, variance=Invariant):
         super().__init__("*")
         self.bound = bound
@@ -375,7 +429,7 @@ class WildCardType(Type):
                 self.bound == other.bound)
 
     def __hash__(self):
-        return hash((self.name, self.variance))
+        return self._hash or self.cache_hash(hash((self.name, self.variance)))
 
     def __str__(self):
         if not self.bound:
@@ -391,46 +445,43 @@ class WildCardType(Type):
         return False
 
 
-def _get_type_substitution(etype, type_map,
-                           cond=lambda t: t.has_type_variables(),
-                           substitute_bound=True):
+def _substitute(etype, type_map, cond, substitute_bound):
+    # Every component of 'etype' that is not affected by the substitution is
+    # shared with the result. If the substitution does not change 'etype' at
+    # all, we return 'etype' itself.
     if etype.is_parameterized():
-        return substitute_type_args(etype, type_map, cond)
+        return _substitute_type_args(etype, type_map, cond, True)
     if etype.is_wildcard() and etype.bound is not None:
-        new_bound = _get_type_substitution(etype.bound, type_map, cond,
-                                           substitute_bound)
+        new_bound = _substitute(etype.bound, type_map, cond, substitute_bound)
+        if new_bound is etype.bound:
+            return etype
         return WildCardType(new_bound, variance=etype.variance)
     t = type_map.get(etype)
     if t is None or cond(t):
         # Perform type substitution on the bound of the current type variable.
         if etype.is_type_var() and etype.bound is not None and \
                 substitute_bound:
-            new_bound = _get_type_substitution(etype.bound, type_map, cond,
-                                               substitute_bound)
-            return (
-                TypeParameter(etype.name, etype.variance, new_bound)
-                if not etype.is_type_constructor()
-                else TypeParameterConstructor(etype.name,
-                                              etype.type_parameters,
-                                              etype.variance, new_bound)
-            )
+            new_bound = _substitute(etype.bound, type_map, cond,
+                                    substitute_bound)
+            if new_bound is etype.bound:
+                return etype
+            return _new_type_param(etype, new_bound)
         # The type parameter does not correspond to an abstract type
         # so, there is nothing to substitute.
         return etype
     return t
 
 
-def substitute_type_args(etype, type_map,
-                         cond=lambda t: t.has_type_variables(),
-                         substitute_bound=True):
-    assert etype.is_parameterized()
-    type_args = []
-    for t_arg in etype.type_args:
-        type_args.append(_get_type_substitution(t_arg, type_map, cond,
-                                                substitute_bound))
+def _substitute_type_args(etype, type_map, cond, substitute_bound):
+    type_args = [
+        _substitute(t_arg, type_map, cond, substitute_bound)
+        for t_arg in etype.type_args
+    ]
     type_con = etype.t_constructor
     t = type_map.get(type_con)
     if t is None or cond(t) or not type_con.is_type_var():
+        if all(new is old for new, old in zip(type_args, etype.type_args)):
+            return etype
         return ParameterizedType(etype.t_constructor, type_args)
 
     assert t.is_type_constructor()
@@ -438,6 +489,42 @@ def substitute_type_args(etype, type_map,
     return t.new(type_args)
 
 
+def _new_type_param(etype, bound):
+    return (
+        TypeParameter(etype.name, etype.variance, bound)
+        if not etype.is_type_constructor()
+        else TypeParameterConstructor(etype.name, etype.type_parameters,
+                                      etype.variance, bound)
+    )
+
+
+def _get_type_substitution(etype, type_map,
+                           cond=lambda t: t.has_type_variables(),
+                           substitute_bound=True):
+    t = _substitute(etype, type_map, cond, substitute_bound)
+    if t is not etype:
+        return t
+    # Callers may modify the type they get back (e.g., its type arguments),
+    # so we return a new type even if the substitution changed nothing.
+    if etype.is_parameterized():
+        return ParameterizedType(etype.t_constructor, etype.type_args)
+    if etype.is_wildcard() and etype.bound is not None:
+        return WildCardType(etype.bound, variance=etype.variance)
+    if etype.is_type_var() and etype.bound is not None and substitute_bound:
+        return _new_type_param(etype, etype.bound)
+    return etype
+
+
+def substitute_type_args(etype, type_map,
+                         cond=lambda t: t.has_type_variables(),
+                         substitute_bound=True):
+    assert etype.is_parameterized()
+    t = _substitute_type_args(etype, type_map, cond, substitute_bound)
+    if t is etype:
+        return ParameterizedType(etype.t_constructor, etype.type_args)
+    return t
+
+
 def substitute_type(t, type_map, substitute_bound=True):
     return _get_type_substitution(t, type_map, lambda t: False,
                                   substitute_bound)
@@ -563,6 +650,8 @@ class TypeConstructor(AbstractType):
 
 
 class TypeParameterConstructor(TypeParameter, TypeConstructor):
+    hash_attrs = ('name', 'variance', 'type_parameters')
+
     def __init__(self, name: str, type_parameters: int,
                  variance=None, bound: Type = None):
         self.name = name
@@ -579,7 +668,8 @@ class TypeParameterConstructor(TypeParameter, TypeConstructor):
                 self.bound == other.bound)
 
     def __hash__(self):
-        return hash((self.name, self.variance, self.arity))
+        return self._hash or self.cache_hash(
+            hash((self.name, self.variance, self.arity)))
 
     def __str__(self):
         return "{variance}{name}[{arity}]{bound}".format(
@@ -4,48 +4,63 @@ from src.ir import types
 
 class ASTVisitor():
 
-    def result(self):
-        raise NotImplementedError('result() must be implemented')
+    # The name of the visit method of each kind of node.
+    VISITORS = {
+        ast.SuperClassInstantiation: 'visit_super_instantiation',
+        ast.ClassDeclaration: 'visit_class_decl',
+        types.TypeParameter: 'visit_type_param',
+        types.TypeParameterConstructor: 'visit_type_param',
+        ast.CallArgument: 'visit_call_argument',
+        ast.FieldDeclaration: 'visit_field_decl',
+        ast.VariableDeclaration: 'visit_var_decl',
+        ast.ParameterDeclaration: 'visit_param_decl',
+        ast.FunctionDeclaration: 'visit_func_decl',
+        ast.Lambda: 'visit_lambda',
+        ast.FunctionReference: 'visit_func_ref',
+        ast.BottomConstant: 'visit_bottom_constant',
+        ast.IntegerConstant: 'visit_integer_constant',
+        ast.RealConstant: 'visit_real_constant',
+        ast.CharConstant: 'visit_char_constant',
+        ast.StringConstant: 'visit_string_constant',
+        ast.ArrayExpr: 'visit_array_expr',
+        ast.BooleanConstant: 'visit_boolean_constant',
+        ast.Variable: 'visit_variable',
+        ast.LogicalExpr: 'visit_logical_expr',
+        ast.EqualityExpr: 'visit_equality_expr',
+        ast.ComparisonExpr: 'visit_comparison_expr',
+        ast.ArithExpr: 'visit_arith_expr',
+        ast.Conditional: 'visit_conditional',
+        ast.Is: 'visit_is',
+        ast.New: 'visit_new',
+        ast.FieldAccess: 'visit_field_access',
+        ast.FunctionCall: 'visit_func_call',
+        ast.Assignment: 'visit_assign',
+        ast.Program: 'visit_program',
+        ast.Block: 'visit_block',
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
+
+    @classmethod
+    def _build_dispatch_table(cls):
+        # Look up the visit methods once per visitor class, rather than
+        # creating a bound method for every kind of node on each visit.
+        cls._dispatch_table = {
+            node_cls: getattr(cls, name)
+            for node_cls, name in cls.VISITORS.items()
+        }
 
     def visit(self, node):
-        visitors = {
-            ast.SuperClassInstantiation: self.visit_super_instantiation,
-            ast.ClassDeclaration: self.visit_class_decl,
-            types.TypeParameter: self.visit_type_param,
-            types.TypeParameterConstructor: self.visit_type_param,
-            ast.CallArgument: self.visit_call_argument,
-            ast.FieldDeclaration: self.visit_field_decl,
-            ast.VariableDeclaration: self.visit_var_decl,
-            ast.ParameterDeclaration: self.visit_param_decl,
-            ast.FunctionDeclaration: self.visit_func_decl,
-            ast.Lambda: self.visit_lambda,
-            ast.FunctionReference: self.visit_func_ref,
-            ast.BottomConstant: self.visit_bottom_constant,
-            ast.IntegerConstant: self.visit_integer_constant,
-            ast.RealConstant: self.visit_real_constant,
-            ast.CharConstant: self.visit_char_constant,
-            ast.StringConstant: self.visit_string_constant,
-            ast.ArrayExpr: self.visit_array_expr,
-            ast.BooleanConstant: self.visit_boolean_constant,
-            ast.Variable: self.visit_variable,
-            ast.LogicalExpr: self.visit_logical_expr,
-            ast.EqualityExpr: self.visit_equality_expr,
-            ast.ComparisonExpr: self.visit_comparison_expr,
-            ast.ArithExpr: self.visit_arith_expr,
-            ast.Conditional: self.visit_conditional,
-            ast.Is: self.visit_is,
-            ast.New: self.visit_new,
-            ast.FieldAccess: self.visit_field_access,
-            ast.FunctionCall: self.visit_func_call,
-            ast.Assignment: self.visit_assign,
-            ast.Program: self.visit_program,
-            ast.Block: self.visit_block,
-        }
-        visitor = visitors.get(node.__class__)
+        visitor = self._dispatch_table.get(node.__class__)
         if visitor is None:
             raise Exception(
                 "Cannot find visitor for instance node " + str(node.__class__))
-        return visitor(node)
+        return visitor(self, node)
+
+    def result(self):
+        raise NotImplementedError('result() must be implemented')
 
     def visit_program(self, node):
         raise NotImplementedError('visit_program() must be implemented')
@@ -144,6 +159,9 @@ class ASTVisitor():
         raise NotImplementedError('visit_assign() must be implemented')
 
 
+ASTVisitor._build_dispatch_table()
+
+
 class DefaultVisitor(ASTVisitor):
 
     def result(self):
@@ -0,0 +1,60 @@
+"""
+Bisection of the batches that crash the compiler.
+
+When a batch of programs crashes the compiler, we do not know which of the
+programs triggers the crash. The bisection recompiles halves of the batch
+until it isolates a minimal set of crashing programs, so that only these
+programs are reported as faults.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+
+def bisect(items: List, crashes: Callable[[List], str],
+           max_invocations: int, workers: int = 1) -> Tuple[List, str, int]:
+    """
+    Narrow down the given crashing items to a smaller set of crashing items.
+
+    `crashes` compiles the given items and returns the crash message of the
+    compiler, or None if the compiler did not crash. In every round we split
+    the suspects into two halves and keep the half that crashes. When
+    `workers` > 1, both halves are compiled concurrently, otherwise the
+    second half is compiled only if the first one does not crash.
+
+    The bisection stops when a single item remains, when no half crashes on
+    its own (i.e., the crash needs programs from both halves), or when the
+    next round would exceed `max_invocations` invocations of `crashes`.
+
+    Returns the suspects, the crash message of the last crashing compilation
+    (None if there was none), and the number of invocations of `crashes`.
+    """
+    suspects = list(items)
+    crash_msg = None
+    invocations = 0
+    pool = ThreadPoolExecutor(workers) if workers > 1 else None
+    try:
+        while len(suspects) > 1:
+            mid = len(suspects) // 2
+            halves = (suspects[:mid], suspects[mid:])
+            if pool and invocations + 2 <= max_invocations:
+                msgs = list(pool.map(crashes, halves))
+                invocations += 2
+            elif invocations < max_invocations:
+                msgs = [crashes(halves[0])]
+                invocations += 1
+                if msgs[0] is None:
+                    if invocations >= max_invocations:
+                        break
+                    msgs.append(crashes(halves[1]))
+                    invocations += 1
+            else:
+                break
+            crashing = [(half, msg) for half, msg in zip(halves, msgs)
+                        if msg is not None]
+            if not crashing:
+                break
+            suspects, crash_msg = crashing[0]
+    finally:
+        if pool:
+            pool.shutdown()
+    return suspects, crash_msg, invocations
@@ -0,0 +1,103 @@
+"""
+Checkpoints of long-running testing sessions.
+
+A checkpoint consists of the state of the run (the next program id, the
+elapsed time, and the statistics so far), and the state of every program
+generator of the run (e.g., the cursor of the API enumeration). Both are
+saved in a single file, so that the statistics always correspond to the
+programs enumerated by the generators. Checkpoints are stored in the
+`checkpoints` directory of the testing session, and they are used by the
+`--resume` option.
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+CHECKPOINT_DIR = "checkpoints"
+# Minimum number of seconds between two consecutive checkpoints.
+CHECKPOINT_INTERVAL = 60
+
+
+def get_run_path(test_directory: str) -> str:
+    return os.path.join(test_directory, CHECKPOINT_DIR, "run.pickle")
+
+
+def save_checkpoint(path: str, state: dict):
+    dst_dir = os.path.dirname(path)
+    os.makedirs(dst_dir, exist_ok=True)
+    # Write the checkpoint to a temporary file first, and then rename it, so
+    # that a killed run never leaves a partially written checkpoint.
+    fd, tmp_path = tempfile.mkstemp(dir=dst_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            pickle.dump(state, out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_checkpoint(path: str) -> dict:
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class Checkpointer():
+    """
+    Periodically saves the checkpoints of the batches of a run.
+
+    A batch is registered when it is generated, along with the state of the
+    run right after its generation, and it is marked as done when its
+    results are recorded. Batches may finish out of order (e.g., when
+    several threads compile batches), so the state of a batch is saved only
+    when all the batches registered before it are done.
+
+    If given, `merge` is called with the result of every batch (e.g., its
+    statistics) in the order the batches were registered, right before the
+    state of the batch becomes the one to save. This way, the results merged
+    so far always correspond to the state that is saved next.
+    """
+
+    def __init__(self, save, interval=CHECKPOINT_INTERVAL, merge=None):
+        self.save = save
+        self.interval = interval
+        self.merge = merge
+        self.pending = OrderedDict()
+        self.latest = None
+        self.last_save = time.time()
+        self.lock = threading.Lock()
+
+    def add(self, batch_id, state):
+        with self.lock:
+            self.pending[batch_id] = [state, False, None]
+
+    def done(self, batch_id, result=None):
+        with self.lock:
+            self.pending[batch_id][1:] = [True, result]
+            while self.pending:
+                first = next(iter(self.pending))
+                state, is_done, result = self.pending[first]
+                if not is_done:
+                    break
+                del self.pending[first]
+                if self.merge is not None:
+                    self.merge(result)
+                self.latest = state
+            if time.time() - self.last_save >= self.interval:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.latest is not None:
+            self.save(self.latest)
+            self.latest = None
+        self.last_save = time.time()
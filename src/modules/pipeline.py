@@ -0,0 +1,52 @@
+import queue
+import threading
+import traceback
+
+
+_STOP = object()
+
+
+class Pipeline():
+    """
+    A producer/consumer pipeline.
+
+    The producer submits items to a bounded queue, and a number of consumer
+    threads drain the queue concurrently by calling `consumer` on every item.
+    When the queue is full, `submit` blocks until a consumer takes an item
+    from the queue (back-pressure), so the producer never runs more than
+    `depth` items ahead of the consumers.
+    """
+
+    def __init__(self, consumer, depth, workers=1, print_stacktrace=False):
+        self.consumer = consumer
+        self.print_stacktrace = print_stacktrace
+        self.queue = queue.Queue(maxsize=depth)
+        self.threads = [
+            threading.Thread(target=self._consume, daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _consume(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            try:
+                self.consumer(*item)
+            except Exception as exc:
+                err = (traceback.format_exc() if self.print_stacktrace
+                       else str(exc))
+                print('Internal error in pipeline consumer')
+                print(err)
+
+    def submit(self, *args):
+        self.queue.put(args)
+
+    def close(self):
+        """Wait until all submitted items are consumed."""
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
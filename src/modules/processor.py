@@ -1,16 +1,22 @@
 # pylint: disable=too-few-public-methods
-import json
-import os
 import sys
 
 from src.generators import Generator
-from src.generators.api import APIGenerator
+from src.generators.api import APIGenerator, cache as api_cache
 from src.transformations.type_erasure import TypeErasure
 from src.transformations.type_overwriting import TypeOverwriting
 from src.utils import random, read_lines, load_program
 from src.modules.logging import Logger
 
 
+def build_api_graph(args, options):
+    """Build the API graph of the API generator for the given arguments."""
+    builder = APIGenerator.API_GRAPH_BUILDERS[args.language](args.language,
+                                                            **options)
+    return api_cache.build_api_graph(builder, args.api_doc_path,
+                                     args.api_graph_cache)
+
+
 class ProgramProcessor():
 
     # Correctness-preserving transformations
@@ -28,20 +34,23 @@ class ProgramProcessor():
         'api': APIGenerator
     }
 
-    def __init__(self, proc_id, args):
+    def __init__(self, proc_id, args, shard=None, api_graph=None):
         self.proc_id = proc_id
         self.args = args
+        # A pair (i, n) denoting that this processor enumerates only the i-th
+        # out of n shards of the programs (used only with the API generator).
+        self.shard = shard
         self.transformations = [
             ProgramProcessor.CP_TRANSFORMATIONS[t]
             for t in self.args.transformation_types
         ]
         self.ncp_transformations = list(
             ProgramProcessor.NCP_TRANSFORMATIONS.values())
-        self.program_generator = self._get_generator()
+        self.program_generator = self._get_generator(api_graph)
         self.transformation_schedule = self._get_transformation_schedule()
         self.current_transformation = 0
 
-    def _get_generator(self):
+    def _get_generator(self, api_graph=None):
         if self.args.log:
             logger = Logger(self.args.name, self.args.test_directory,
                             self.proc_id, "Generator",
@@ -54,11 +63,10 @@ class ProgramProcessor():
             "options": self.args.options["Generator"][self.args.generator],
         }
         if self.args.generator == "api":
-            docs = {}
-            for api_path in os.listdir(self.args.api_doc_path):
-                with open(os.path.join(self.args.api_doc_path, api_path)) as f:
-                    docs[api_path.replace(".json", "")] = json.load(f)
-            kwargs["api_docs"] = docs
+            if self.shard is not None:
+                kwargs["options"] = dict(kwargs["options"], shard=self.shard)
+            kwargs["api_graph"] = api_graph or build_api_graph(
+                self.args, kwargs["options"])
         return self.PROGRAM_GENERATORS.get(self.args.generator)(**kwargs)
 
     def _apply_transformation(self, transformation_cls,
@@ -98,6 +106,12 @@ class ProgramProcessor():
             schedule.append(transformation)
         return schedule
 
+    def get_checkpoint(self):
+        return self.program_generator.get_checkpoint()
+
+    def restore_checkpoint(self, state):
+        self.program_generator.restore_checkpoint(state)
+
     def get_program(self):
         if self.args.replay:
             if self.args.debug:
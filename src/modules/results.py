@@ -0,0 +1,135 @@
+"""
+An append-only log of the results of a testing session.
+
+Every compiled batch appends one JSON line to the `results.jsonl` file of
+the testing session. A line holds the id of the first program of the batch,
+the worker that generated the batch, the number of passed and failed
+programs of the batch, its synthesis and compilation time, and the faults
+found in the batch (keyed by program id, as in `faults.json`). Appending a batch
+costs the same regardless of how many faults the session has found so far.
+
+The functions of this module read the log lazily, so tools that inspect the
+faults of a session do not need to load all of them into memory.
+"""
+import json
+import os
+import tempfile
+from typing import Callable, Iterator, Tuple
+
+
+RESULTS_FILE = "results.jsonl"
+
+
+def get_results_path(test_directory: str) -> str:
+    return os.path.join(test_directory, RESULTS_FILE)
+
+
+class ResultLog():
+    def __init__(self, path: str):
+        self.path = path
+        self._terminate_last_line()
+
+    def _terminate_last_line(self):
+        # A killed run may leave a partially written line behind. When the
+        # session is resumed, we start the next record on a new line.
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def append(self, batch: int, faults: dict, passed: int, failed: int,
+               synthesis_time: float, compilation_time: float,
+               worker: int = 0):
+        record = {
+            "batch": batch,
+            "worker": worker,
+            "passed": passed,
+            "failed": failed,
+            "synthesis_time": synthesis_time,
+            "compilation_time": compilation_time,
+            "faults": faults,
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a') as out:
+            out.write(json.dumps(record) + "\n")
+
+
+def read_results(path: str) -> Iterator[dict]:
+    """Yield the records of the given log, one per batch."""
+    if not os.path.isfile(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # The run was killed while it was appending this line.
+                continue
+
+
+def filter_results(path: str, predicate: Callable[[dict], bool]):
+    """
+    Keep only the records of the given log that satisfy the predicate (e.g.,
+    drop the batches that a resumed run compiles again).
+    """
+    if not os.path.isfile(path):
+        return
+    dst_dir = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dst_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as out:
+            for record in read_results(path):
+                if predicate(record):
+                    out.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def iter_faults(path: str,
+                predicate: Callable[[dict], bool] = None
+                ) -> Iterator[Tuple[str, dict]]:
+    """
+    Yield the (program id, fault) pairs of the given log. When a predicate
+    is given, yield only the faults that satisfy it.
+    """
+    for record in read_results(path):
+        for pid, fault in record["faults"].items():
+            if predicate is None or predicate(fault):
+                yield pid, fault
+
+
+def load_faults(path: str) -> dict:
+    """Return all the faults of the given log, in the format of faults.json."""
+    return dict(iter_faults(path))
+
+
+def summarize(path: str) -> dict:
+    """Compute the totals of the given log."""
+    summary = {
+        "totals": {
+            "passed": 0,
+            "failed": 0
+        },
+        "synthesis_time": 0,
+        "compilation_time": 0,
+    }
+    for record in read_results(path):
+        summary["totals"]["passed"] += record["passed"]
+        summary["totals"]["failed"] += record["failed"]
+        summary["synthesis_time"] += record["synthesis_time"]
+        summary["compilation_time"] += record["compilation_time"]
+    return summary
+
+
+def export_faults(path: str, dst: str):
+    """Write the faults of the given log into a faults.json file."""
+    with open(dst, 'w') as out:
+        json.dump(load_faults(path), out, indent=2)
@@ -0,0 +1,90 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * A long-lived compiler server used by thalia's "daemon" compiler backend.
+ *
+ * The server keeps a warm JVM and serves compile requests read from stdin.
+ * Every request is a single line that contains the arguments of the compiler
+ * separated by '\0'. For every request, the server prints the diagnostics of
+ * the compiler followed by the line "@@thalia-exit STATUS".
+ *
+ * Usage: java [-cp COMPILER_CLASSPATH] CompileServer.java (javac|kotlinc|scalac)
+ */
+public class CompileServer {
+    static final String EXIT_MARKER = "@@thalia-exit ";
+
+    public static void main(String[] args) throws Exception {
+        String compiler = args[0];
+        BufferedReader in = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        PrintStream protocolOut = new PrintStream(
+            new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] compilerArgs = line.isEmpty()
+                ? new String[0] : line.split("\0");
+            ByteArrayOutputStream buffer = new ByteArrayOutputStream();
+            PrintStream out = new PrintStream(buffer, true, "UTF-8");
+            PrintStream oldOut = System.out;
+            PrintStream oldErr = System.err;
+            System.setOut(out);
+            System.setErr(out);
+            int status;
+            try {
+                status = compile(compiler, compilerArgs, out);
+            } catch (Throwable t) {
+                // Report the exception as the output of the compiler, so
+                // that thalia detects it as a compiler crash.
+                Throwable cause = t.getCause() != null ? t.getCause() : t;
+                cause.printStackTrace(out);
+                status = 1;
+            } finally {
+                System.setOut(oldOut);
+                System.setErr(oldErr);
+            }
+            out.flush();
+            String output = buffer.toString("UTF-8");
+            protocolOut.print(output);
+            if (!output.isEmpty() && !output.endsWith("\n")) {
+                protocolOut.println();
+            }
+            protocolOut.println(EXIT_MARKER + status);
+            protocolOut.flush();
+        }
+    }
+
+    static int compile(String compiler, String[] args, PrintStream out)
+            throws Exception {
+        switch (compiler) {
+            case "javac":
+                return javax.tools.ToolProvider.getSystemJavaCompiler()
+                    .run(null, out, out, args);
+            case "kotlinc": {
+                Class<?> cls = Class.forName(
+                    "org.jetbrains.kotlin.cli.jvm.K2JVMCompiler");
+                Object kotlinc = cls.getDeclaredConstructor().newInstance();
+                Method exec = cls.getMethod("exec", PrintStream.class,
+                                            String[].class);
+                Object exitCode = exec.invoke(kotlinc, out, args);
+                return "OK".equals(exitCode.toString()) ? 0 : 1;
+            }
+            case "scalac": {
+                Class<?> cls = Class.forName("dotty.tools.dotc.Main");
+                Method process = cls.getMethod("process", String[].class);
+                Object reporter = process.invoke(null, (Object) args);
+                Method hasErrors = reporter.getClass().getMethod("hasErrors");
+                return (Boolean) hasErrors.invoke(reporter) ? 1 : 0;
+            }
+            default:
+                throw new IllegalArgumentException(
+                    "Unsupported compiler: " + compiler);
+        }
+    }
+}
@@ -66,6 +66,10 @@ class TypeErasure(Transformation):
                         g_node.decl.omit_type()
                     if isinstance(g_node,
                                   tda.TypeConstructorInstantiationCallNode):
-                        g_node.t.can_infer_type_args = True
+                        call = g_node.constructor_call
+                        if not isinstance(call, ast.New):
+                            # A call of a parameterized function.
+                            call = g_node.t
+                        call.omit_types()
                 break
         return node
@@ -1,3 +1,5 @@
+from copy import copy
+
 from src import utils
 from src.ir import ast, type_utils as tu, types as tp
 from src.transformations.base import Transformation, change_namespace
@@ -111,7 +113,14 @@ class TypeOverwriting(Transformation):
                 t_param: i
                 for i, t_param in enumerate(type_parameters)
             }
-            n.t.type_args[indexes[type_param.t]] = ir_type
+            t = n.t
+            if isinstance(n.constructor_call, ast.New):
+                # Types may be shared with other programs, so we overwrite
+                # a copy of the class type.
+                t = copy(t)
+                n.constructor_call.class_type = t
+            t.type_args = list(t.type_args)
+            t.type_args[indexes[type_param.t]] = ir_type
         self.is_transformed = True
         self.error_injected = "{} expected but {} found in node {}".format(
             str(old_type), str(ir_type), n.node_id)
@@ -201,7 +201,7 @@ class JavaTranslator(BaseTranslator):
         if not len_c:
             return []
         res = self._children_res[-len_c:]
-        self._children_res = self._children_res[:-len_c]
+        del self._children_res[-len_c:]
         return res
 
     def _get_main_prefix(self, decl_type, name):
@@ -115,7 +115,7 @@ class KotlinTranslator(BaseTranslator):
         if not len_c:
             return []
         res = self._children_res[-len_c:]
-        self._children_res = self._children_res[:-len_c]
+        del self._children_res[-len_c:]
         return res
 
     def visit_program(self, node):
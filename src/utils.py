@@ -1,6 +1,11 @@
 from collections import defaultdict
+from contextlib import contextmanager
 from typing import Tuple, List
+import functools
+import gc
+import io
 import random
+import re
 import string
 import pickle
 import os
@@ -30,6 +35,11 @@ def is_number(string_var):
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def _get_split_regex(chars: str):
+    return re.compile("[" + re.escape(chars) + "]")
+
+
 def top_level_split(s: str, signs: Tuple[str] = (["<"], [">"]),
                     delim=",") -> List[str]:
     """
@@ -38,25 +48,25 @@ def top_level_split(s: str, signs: Tuple[str] = (["<"], [">"]),
 
     Taken from: https://stackoverflow.com/a/33527583
     """
-    # Parse the string tracking whether the current character is within
-    # parentheses.
+    # Scan only the signs and the delimiters of the string tracking whether
+    # the current character is within parentheses, and slice the parts.
     balance = 0
     parts = []
-    part = ''
+    part_start = 0
     start, end = signs
-
-    for c in s:
-        part += c
+    regex = _get_split_regex("".join(start) + "".join(end) + delim)
+    for match in regex.finditer(s):
+        c = match.group()
         if c in start:
             balance += 1
         elif c in end:
             balance -= 1
-        elif c == delim and balance == 0:
-            parts.append(part[:-1].strip())
-            part = ''
+        elif balance == 0:
+            parts.append(s[part_start:match.start()].strip())
+            part_start = match.end()
     # Capture last part
-    if len(part):
-        parts.append(part.strip())
+    if part_start < len(s):
+        parts.append(s[part_start:].strip())
 
     return parts
 
@@ -111,12 +121,42 @@ def translate_program(translator, program):
     return translator.result()
 
 
+@contextmanager
+def gc_disabled():
+    """
+    Pause the cyclic garbage collector. Loading a program creates thousands
+    of objects at once, which would otherwise trigger many useless
+    collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 def load_program(path):
-    with open(path, 'rb') as initial_bin:
+    """Load a program saved in any of the formats of `dump_program`."""
+    from src.ir import serialization
+    with open(path, 'rb') as initial_bin, gc_disabled():
+        if serialization.is_encoded(initial_bin):
+            return serialization.load(
+                io.TextIOWrapper(initial_bin, encoding='utf-8'))
         return pickle.load(initial_bin)
 
 
-def dump_program(path, program):
+def dump_program(path, program, program_format="pickle"):
+    """
+    Save a program either as a pickle, or using the versioned encoding of
+    the IR (see `src/ir/serialization.py`).
+    """
+    if program_format == "ir":
+        from src.ir import serialization
+        with open(path, 'w', encoding='utf-8') as out, gc_disabled():
+            serialization.dump(program, out)
+        return
     with open(path, 'wb') as out:
         pickle.dump(program, out)
 
@@ -148,29 +188,51 @@ class RandomUtils():
     resource_path = os.path.join(os.path.split(__file__)[0], "resources")
 
     WORD_POOL_LEN = 10000
-    # Construct a random word pool of size 'WORD_POOL_LEN'.
-    WORDS = set(random.sample(
+    # Construct a random word pool of size 'WORD_POOL_LEN'. The pool and the
+    # order of its words are the same in every process (a dict rather than a
+    # set, whose order depends on PYTHONHASHSEED), so that the same seed
+    # gives the same names.
+    WORDS = dict.fromkeys(random.Random(0).sample(
         read_lines(os.path.join(resource_path, 'words')), WORD_POOL_LEN))
-    INITIAL_WORDS = set(WORDS)
+    INITIAL_WORDS = dict(WORDS)
 
     def __init__(self, seed=None):
         self.r = random.Random(seed)
 
+    def seed(self, *keys):
+        """Re-seed the generator with a seed derived from the given keys."""
+        self.r.seed(":".join(str(k) for k in keys))
+
+    @contextmanager
+    def isolated(self, *keys):
+        """
+        Run a block with a random stream derived from the given keys, and
+        restore the current random stream afterwards.
+        """
+        state = self.r.getstate()
+        self.seed(*keys)
+        try:
+            yield
+        finally:
+            self.r.setstate(state)
+
     def reset_word_pool(self):
-        self.WORDS = set(self.INITIAL_WORDS)
+        self.WORDS = dict(self.INITIAL_WORDS)
 
     def bool(self, prob=0.5):
         return self.r.random() < prob
 
     def word(self):
         word = self.r.choice(tuple(self.WORDS))
-        self.WORDS.remove(word)
+        del self.WORDS[word]
         return word
 
     def remove_reserved_words(self, language):
         reserved_words = get_reserved_words(self.resource_path, language)
-        self.INITIAL_WORDS = self.INITIAL_WORDS - reserved_words
-        self.WORDS = self.WORDS - reserved_words
+        self.INITIAL_WORDS = {w: None for w in self.INITIAL_WORDS
+                              if w not in reserved_words}
+        self.WORDS = {w: None for w in self.WORDS
+                      if w not in reserved_words}
 
     def integer(self, min_int=0, max_int=10):
         return self.r.randint(min_int, max_int)
@@ -0,0 +1,72 @@
+"""
+Compare the size and the throughput of the formats of the saved programs.
+
+Usage: python -m tests.benchmark_serialization DIR [DIR ...]
+
+The programs are the *.bin files found under the given directories, e.g.,
+the `generator/` directory of a testing session run with --keep-all.
+"""
+import glob
+import io
+import os
+import pickle
+import zlib
+
+from src import utils
+from src.ir import serialization
+from tests.benchmark_utils import get_parser, measure
+
+
+def pickle_dumps(program):
+    return pickle.dumps(program)
+
+
+def pickle_loads(data):
+    with utils.gc_disabled():
+        return pickle.loads(data)
+
+
+def ir_dumps(program):
+    out = io.StringIO()
+    with utils.gc_disabled():
+        serialization.dump(program, out)
+    return out.getvalue().encode()
+
+
+def ir_loads(data):
+    return serialization.load(io.StringIO(data.decode()))
+
+
+FORMATS = {
+    "pickle": (pickle_dumps, pickle_loads),
+    "ir": (ir_dumps, ir_loads),
+}
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument("dirs", nargs="+")
+    args = parser.parse_args()
+    paths = [p for d in args.dirs
+             for p in glob.glob(os.path.join(d, "**", "*.bin"),
+                                recursive=True)]
+    programs = [utils.load_program(p) for p in sorted(paths)]
+    if not programs:
+        parser.error("no saved programs found")
+    print("{} programs".format(len(programs)))
+    print("{:<8}{:>12}{:>12}{:>14}{:>14}".format(
+        "format", "dump (ms)", "load (ms)", "size (KiB)", "zlib (KiB)"))
+    for name, (dumps, loads) in FORMATS.items():
+        data, dump_time = measure(lambda: [dumps(p) for p in programs],
+                                  args.repeat)
+        _, load_time = measure(lambda: [loads(d) for d in data], args.repeat)
+        size = sum(len(d) for d in data)
+        zsize = sum(len(zlib.compress(d)) for d in data)
+        print("{:<8}{:>12.2f}{:>12.2f}{:>14.1f}{:>14.1f}".format(
+            name, dump_time * 1000 / len(programs),
+            load_time * 1000 / len(programs), size / 1024 / len(programs),
+            zsize / 1024 / len(programs)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure how long it takes to translate generated programs into source code.
+
+Usage: python -m tests.benchmark_translators [LANGUAGE ...]
+
+The programs are generated once per language by the base generator, with the
+seeds 0, 1, ..., i.e., they are the same programs in every run.
+"""
+from src import utils
+from src.config import cfg
+from src.ir import BUILTIN_FACTORIES
+from src.generators.generator import Generator
+from src.translators import TRANSLATORS
+from tests.benchmark_utils import get_parser, measure
+
+
+def generate(language, count):
+    cfg.bt_factory = BUILTIN_FACTORIES[language]
+    programs = []
+    for i in range(count):
+        utils.random.seed(language, i)
+        utils.random.reset_word_pool()
+        generator = Generator(language=language)
+        generator.prepare_next_program(i)
+        programs.append(generator.generate())
+    return programs
+
+
+def translate(language, programs):
+    return [utils.translate_program(TRANSLATORS[language](), p)
+            for p in programs]
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument("languages", nargs="*",
+                        default=["java", "kotlin", "groovy"])
+    parser.add_argument("--programs", type=int, default=30)
+    args = parser.parse_args()
+    print("{:<8}{:>16}{:>14}".format("lang", "translate (ms)", "size (KiB)"))
+    for language in args.languages:
+        if language not in TRANSLATORS:
+            parser.error("unsupported language " + language)
+        programs = generate(language, args.programs)
+        results, elapsed = measure(lambda: translate(language, programs),
+                                   args.repeat)
+        size = sum(len(r) for r in results)
+        print("{:<8}{:>16.2f}{:>14.1f}".format(
+            language, elapsed * 1000 / len(programs),
+            size / 1024 / len(programs)))
+
+
+if __name__ == "__main__":
+    main()
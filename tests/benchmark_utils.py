@@ -0,0 +1,30 @@
+"""
+Helpers shared by the benchmarks (tests/benchmark_*.py).
+"""
+import argparse
+import time
+
+
+def get_parser(doc, repeat=3):
+    """
+    Return the argument parser of a benchmark, described by the first line of
+    its docstring, with an option for the number of repetitions.
+    """
+    parser = argparse.ArgumentParser(description=doc.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=repeat)
+    return parser
+
+
+def measure(func, repeat):
+    """
+    Call `func` `repeat` times, and return the result and the elapsed time of
+    the fastest call.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[1]:
+            best = (result, elapsed)
+    return best
@@ -0,0 +1,72 @@
+"""
+Measure how many nodes per second a visitor dispatches on generated programs.
+
+Usage: python -m tests.benchmark_visitors [LANGUAGE ...]
+
+The dispatch table of the visitors is compared against building a dict of
+the bound visit methods on every visit, i.e., the dispatch of `ASTVisitor`
+before the table.
+"""
+from src.ir.visitors import DefaultVisitor
+from tests.benchmark_translators import generate
+from tests.benchmark_utils import get_parser, measure
+
+
+class NodeCounter(DefaultVisitor):
+    def __init__(self):
+        self.visits = 0
+
+    def result(self):
+        return self.visits
+
+    def visit(self, node):
+        self.visits += 1
+        return super().visit(node)
+
+
+class BoundMethodsNodeCounter(NodeCounter):
+    def visit(self, node):
+        self.visits += 1
+        visitors = {
+            node_cls: getattr(self, name)
+            for node_cls, name in self.VISITORS.items()
+        }
+        visitor = visitors.get(node.__class__)
+        if visitor is None:
+            raise Exception(
+                "Cannot find visitor for instance node " + str(node.__class__))
+        return visitor(node)
+
+
+VISITORS = {
+    "table": NodeCounter,
+    "bound": BoundMethodsNodeCounter,
+}
+
+
+def count_visits(visitor_cls, programs):
+    visitor = visitor_cls()
+    for program in programs:
+        visitor.visit(program)
+    return visitor.result()
+
+
+def main():
+    parser = get_parser(__doc__, repeat=5)
+    parser.add_argument("languages", nargs="*",
+                        default=["java", "kotlin", "groovy"])
+    parser.add_argument("--programs", type=int, default=30)
+    args = parser.parse_args()
+    print("{:<8}{:<8}{:>10}{:>14}".format(
+        "lang", "visitor", "visits", "visits/s"))
+    for language in args.languages:
+        programs = generate(language, args.programs)
+        for name, visitor_cls in VISITORS.items():
+            visits, elapsed = measure(
+                lambda: count_visits(visitor_cls, programs), args.repeat)
+            print("{:<8}{:<8}{:>10}{:>14.0f}".format(
+                language, name, visits, visits / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+from src import utils
+from src.config import cfg
+from src.ir import BUILTIN_FACTORIES
+from src.generators.api import APIGenerator
+from src.translators import TRANSLATORS
+from tests.test_api_graph import DOCS3
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _enumerate_programs(docs, language, shard=None, checkpoint=None,
+                        limit=None):
+    cfg.bt_factory = BUILTIN_FACTORIES[language]
+    options = {"seed": 42}
+    if shard is not None:
+        options["shard"] = shard
+    generator = APIGenerator(docs, options=options, language=language)
+    if checkpoint is not None:
+        generator.restore_checkpoint(checkpoint)
+    programs = []
+    while limit is None or len(programs) < limit:
+        utils.random.reset_word_pool()
+        generator.prepare_next_program(0)
+        program = generator.generate()
+        if program is None:
+            break
+        programs.append(utils.translate_program(TRANSLATORS[language](),
+                                                program))
+    if limit is not None:
+        return programs, generator.get_checkpoint()
+    return programs
+
+
+def test_sharded_enumeration():
+    programs = _enumerate_programs(DOCS3, "java")
+    assert programs
+    assert _enumerate_programs(DOCS3, "java") == programs
+
+    sharded_programs = []
+    for shard in range(3):
+        sharded_programs.extend(_enumerate_programs(DOCS3, "java",
+                                                    (shard, 3)))
+    assert sorted(sharded_programs) == sorted(programs)
+
+
+def test_sharded_encoding():
+    cfg.bt_factory = BUILTIN_FACTORIES["java"]
+    api_graph = APIGenerator(DOCS3, options={"seed": 42},
+                             language="java").api_graph
+    encodings = [(e.position, e.receivers, e.parameters, e.returns)
+                 for e in api_graph.encode_api_components()]
+    sharded_encodings = []
+    for shard in range(3):
+        sharded_encodings.extend(
+            (e.position, e.receivers, e.parameters, e.returns)
+            for e in api_graph.encode_api_components(shard=(shard, 3)))
+    # Every shard encodes only its own APIs.
+    assert sorted(sharded_encodings, key=str) == sorted(encodings, key=str)
+
+
+def test_resumed_enumeration():
+    programs = _enumerate_programs(DOCS3, "java")
+    for limit in [1, len(programs) // 2]:
+        first, checkpoint = _enumerate_programs(DOCS3, "java", limit=limit)
+        rest = _enumerate_programs(DOCS3, "java", checkpoint=checkpoint)
+        assert first + rest == programs
+
+
+def _enumerate_programs_with_hash_seed(language, hash_seed):
+    # The order of sets (e.g., of types) depends on the hash seed of the
+    # interpreter, so we enumerate the programs in a fresh one.
+    script = (
+        "import json\n"
+        "from tests.test_api_generator import _enumerate_programs\n"
+        "from tests.test_api_graph import DOCS3\n"
+        "print(json.dumps(_enumerate_programs(DOCS3, {!r})))\n"
+    ).format(language)
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    output = subprocess.check_output([sys.executable, "-c", script], env=env,
+                                     cwd=ROOT_DIR)
+    return json.loads(output)
+
+
+def test_enumeration_independent_of_hash_seed():
+    programs = _enumerate_programs_with_hash_seed("java", 1)
+    assert programs
+    assert _enumerate_programs_with_hash_seed("java", 2) == programs
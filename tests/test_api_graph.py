@@ -440,6 +440,46 @@ def test3():
     ]
 
 
+def test_get_sources_and_target():
+    b = JavaAPIGraphBuilder("java")
+    api_graph = b.build(DOCS1)
+    foo = b.parse_type("java.Foo")
+    set_t = b.parse_type("java.Set")
+    sources, target = api_graph.get_sources_and_target(set_t, "concrete")
+    assert target == set_t
+    assert sources == [foo]
+
+    api_graph.add_variable_node("x", b.parse_type("java.List"))
+    sources, _ = api_graph.get_sources_and_target(set_t, "concrete")
+    assert set(sources) == {foo, ag.Variable("x")}
+    sources, _ = api_graph.get_sources_and_target(foo, "concrete")
+    assert sources == []
+
+    # Foo is no longer a source node.
+    api_graph.add_variable_node("y", foo)
+    sources, _ = api_graph.get_sources_and_target(set_t, "concrete")
+    assert set(sources) == {ag.Variable("x"), ag.Variable("y")}
+
+    api_graph.remove_variable_node("x")
+    api_graph.remove_variable_node("y")
+    sources, _ = api_graph.get_sources_and_target(set_t, "concrete")
+    assert sources == [foo]
+
+
+def test_get_shortest_paths():
+    for docs in [DOCS1, DOCS2, DOCS3, DOCS5]:
+        b = JavaAPIGraphBuilder("java")
+        api_graph = b.build(docs)
+        for target in api_graph.api_graph.nodes():
+            if not isinstance(target, tp.Type):
+                continue
+            for source in api_graph.source_index.get_sources(target):
+                paths = api_graph._get_shortest_paths(source, target)
+                expected = nx.all_shortest_paths(api_graph.api_graph,
+                                                 source, target)
+                assert sorted(map(str, paths)) == sorted(map(str, expected))
+
+
 def test4():
     b = JavaAPIGraphBuilder("java")
     api_graph = b.build(DOCS5)
@@ -572,6 +612,13 @@ def test_get_function_refs_of():
     refs = api_graph.get_function_refs_of(b.parse_type("java.lang.Object"))
     assert refs == []
 
+    etype = b.parse_type("java.Function<java.lang.String,java.lang.Object>")
+    refs = api_graph.get_function_refs_of(etype)
+    for _ in range(10):
+        single_refs = api_graph.get_function_refs_of(etype, single=True)
+        assert len(single_refs) == 1
+        assert single_refs[0] in refs
+
 
 def test_get_function_refs_of_receiver():
     b = KotlinAPIGraphBuilder("kotlin")
@@ -825,3 +872,31 @@ def test_get_overloaded_methods_with_receiver():
     assert methods == set()
     methods = api_graph.get_overloaded_methods(rec, m2)
     assert methods == set()
+
+
+def test_get_available_types():
+    subtyping_graph = nx.DiGraph()
+    t1 = tp.TypeConstructor("A", [tp.TypeParameter("T1")])
+    array = jt.Array
+    subtyping_graph.add_nodes_from([jt.IntegerType(primitive=True),
+                                    jt.String, t1, array])
+    api_graph = ag.APIGraph(nx.DiGraph(), subtyping_graph, [],
+                            jt.JavaBuiltinFactory())
+    types = api_graph.get_available_types(t1)
+    # Primitives are boxed.
+    assert [t.name for t in types] == ["Integer", "String", "A", "Array"]
+    assert not any(getattr(t, "primitive", False) for t in types)
+    assert t1 in types
+    assert api_graph.get_available_types(t1) is types
+    assert t1 not in api_graph.get_available_types(array)
+
+    type_param = tp.TypeParameter("X")
+    api_graph.add_types([type_param])
+    assert type_param in api_graph.get_available_types(t1)
+    assert type_param not in api_graph.get_available_types(array)
+    api_graph.remove_types([type_param])
+    assert type_param not in api_graph.get_available_types(t1)
+
+    t, type_var_map = api_graph.instantiate_type_constructor(
+        t1, {t1.type_parameters[0]: jt.String})
+    assert t == t1.new([jt.String])
@@ -0,0 +1,47 @@
+import json
+import os
+
+from src.generators.api import cache
+from src.generators.api.builder import JavaAPIGraphBuilder
+from tests.test_api_graph import DOCS1, DOCS3
+
+
+def _write_docs(path, docs):
+    path.mkdir(exist_ok=True)
+    for name, doc in docs.items():
+        with open(os.path.join(path, name + ".json"), 'w') as out:
+            json.dump(doc, out)
+
+
+def test_api_graph_cache(tmp_path):
+    doc_path = tmp_path / "docs"
+    cache_dir = str(tmp_path / "cache")
+    _write_docs(doc_path, DOCS3)
+
+    api_graph = cache.build_api_graph(JavaAPIGraphBuilder("java"),
+                                      str(doc_path), cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    cached = cache.build_api_graph(JavaAPIGraphBuilder("java"),
+                                   str(doc_path), cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    assert set(cached.api_graph.nodes()) == set(api_graph.api_graph.nodes())
+    assert set(cached.api_graph.edges()) == set(api_graph.api_graph.edges())
+    assert set(cached.subtyping_graph.edges()) == set(
+        api_graph.subtyping_graph.edges())
+    assert cached.functional_types == api_graph.functional_types
+    assert set(cached.types) == set(api_graph.types)
+
+    # Changing the docs invalidates the snapshot.
+    _write_docs(doc_path, DOCS1)
+    cache.build_api_graph(JavaAPIGraphBuilder("java"), str(doc_path),
+                          cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_api_graph_cache_key():
+    files = {"java.Foo": b"{}"}
+    key = cache.compute_key(files, JavaAPIGraphBuilder("java"))
+    assert key == cache.compute_key(files, JavaAPIGraphBuilder("java"))
+    assert key != cache.compute_key(files, JavaAPIGraphBuilder("kotlin"))
+    assert key != cache.compute_key({"java.Foo": b"{ }"},
+                                    JavaAPIGraphBuilder("java"))
@@ -575,3 +575,36 @@ def test_get_instantiations_of_recursive_bound_hk_types():
     types = api_graph.get_instantiations_of_recursive_bound(
         type_param, {}, api_graph.get_reg_types())
     assert types == set()
+
+
+def test_subtypes_memo():
+    b = JavaAPIGraphBuilder("java")
+    api_graph = b.build(DOCS2)
+    number = b.parse_type("java.Number")
+    expected = {number, b.parse_type("java.Integer"),
+                b.parse_type("java.Long")}
+
+    subtypes = api_graph.subtypes(number)
+    assert subtypes == expected
+    # Callers cannot corrupt the memoized results.
+    subtypes.clear()
+    assert api_graph.subtypes(number) == expected
+    supertypes = api_graph.supertypes(b.parse_type("java.Integer"))
+    assert supertypes == {b.parse_type("java.lang.Object"), number}
+
+    api_graph.remove_types([b.parse_type("java.Long")])
+    assert api_graph.subtypes(number) == {number,
+                                          b.parse_type("java.Integer")}
+    assert api_graph.supertypes(b.parse_type("java.Integer")) == supertypes
+
+
+def test_subtypes_of_parameterized_sampling():
+    b = JavaAPIGraphBuilder("java")
+    api_graph = b.build(DOCS1)
+    api_graph.MAX_TYPES = 1
+    t = b.parse_type("java.util.List<? extends java.lang.Object>")
+    # Only the candidate type arguments are memoized; the sampling happens
+    # on every call.
+    samples = {frozenset(api_graph.subtypes_of_parameterized(t))
+               for _ in range(30)}
+    assert len(samples) > 1
@@ -0,0 +1,63 @@
+import threading
+
+from src.modules.bisection import bisect
+
+
+def crashes_with(*culprits):
+    calls = []
+    lock = threading.Lock()
+
+    def crashes(subset):
+        with lock:
+            calls.append(list(subset))
+        if all(c in subset for c in culprits):
+            return "crash " + ",".join(str(c) for c in culprits)
+        return None
+    return crashes, calls
+
+
+def test_bisect_single_culprit():
+    for workers in (1, 2):
+        crashes, calls = crashes_with(37)
+        suspects, msg, invocations = bisect(list(range(50)), crashes, 20,
+                                            workers)
+        assert suspects == [37]
+        assert msg == "crash 37"
+        assert invocations == len(calls)
+        assert invocations <= 12
+
+
+def test_bisect_budget():
+    crashes, calls = crashes_with(30)
+    suspects, msg, invocations = bisect(list(range(50)), crashes, 3, 2)
+    # One parallel round fits into the budget, and then the last invocation
+    # compiles the first half only.
+    assert invocations == 3
+    assert len(calls) == 3
+    assert suspects == list(range(25, 37))
+
+    crashes, calls = crashes_with(37)
+    suspects, msg, invocations = bisect(list(range(50)), crashes, 3, 2)
+    # The first half of the second round does not crash, and there is no
+    # budget left for the second half.
+    assert suspects == list(range(25, 50))
+
+    crashes, calls = crashes_with(37)
+    suspects, msg, invocations = bisect(list(range(50)), crashes, 0)
+    assert suspects == list(range(50))
+    assert msg is None
+    assert calls == []
+
+
+def test_bisect_interacting_culprits():
+    crashes, _ = crashes_with(3, 40)
+    suspects, msg, _ = bisect(list(range(50)), crashes, 20, 2)
+    # The crash needs programs from both halves.
+    assert suspects == list(range(50))
+    assert msg is None
+
+    crashes, _ = crashes_with(3, 7)
+    suspects, msg, _ = bisect(list(range(50)), crashes, 20, 2)
+    assert 3 in suspects and 7 in suspects
+    assert len(suspects) < 50
+    assert msg == "crash 3,7"
@@ -0,0 +1,63 @@
+from src.modules import checkpoint
+
+
+def test_save_and_load_checkpoint(tmp_path):
+    path = checkpoint.get_run_path(str(tmp_path))
+    assert checkpoint.load_checkpoint(path) is None
+    checkpoint.save_checkpoint(path, {"iteration": 10})
+    assert checkpoint.load_checkpoint(path) == {"iteration": 10}
+    checkpoint.save_checkpoint(path, {"iteration": 20})
+    assert checkpoint.load_checkpoint(path) == {"iteration": 20}
+
+
+def test_checkpointer():
+    saved = []
+    checkpointer = checkpoint.Checkpointer(saved.append, interval=0)
+    checkpointer.add(1, "a")
+    checkpointer.add(2, "b")
+    checkpointer.add(3, "c")
+    # Batch 2 finished before batch 1, so there is nothing to save yet.
+    checkpointer.done(2)
+    assert saved == []
+    checkpointer.done(1)
+    assert saved == ["b"]
+    checkpointer.done(3)
+    assert saved == ["b", "c"]
+
+
+def test_checkpointer_merge():
+    saved = []
+    merged = []
+
+    def save(state):
+        saved.append((state, sum(merged)))
+
+    checkpointer = checkpoint.Checkpointer(save, interval=0,
+                                           merge=merged.append)
+    checkpointer.add(1, "a")
+    checkpointer.add(2, "b")
+    checkpointer.add(3, "c")
+    # The result of batch 2 is merged only after the result of batch 1, so
+    # that the results saved with a state are those of its batches.
+    checkpointer.done(2, 20)
+    assert merged == []
+    checkpointer.done(1, 10)
+    assert merged == [10, 20]
+    assert saved == [("b", 30)]
+    checkpointer.done(3, 30)
+    assert saved == [("b", 30), ("c", 60)]
+
+
+def test_checkpointer_interval():
+    saved = []
+    checkpointer = checkpoint.Checkpointer(saved.append, interval=3600)
+    checkpointer.add(1, "a")
+    checkpointer.done(1)
+    checkpointer.add(2, "b")
+    checkpointer.done(2)
+    assert saved == []
+    checkpointer.flush()
+    assert saved == ["b"]
+    # Nothing new to save.
+    checkpointer.flush()
+    assert saved == ["b"]
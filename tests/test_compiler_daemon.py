@@ -0,0 +1,89 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.compilers import daemon
+from src.compilers.java import JavaCompiler
+
+
+# A fake compiler server that speaks the protocol of CompileServer.java.
+# It reports an error for every file whose name contains "Bad", and it
+# exits when it receives the "crash" argument.
+FAKE_SERVER = r'''
+import sys
+for line in sys.stdin:
+    args = line.rstrip("\n").split("\0")
+    if "crash" in args:
+        print("Exception in thread main at jdk.Foo", flush=True)
+        sys.exit(1)
+    status = 0
+    for arg in args:
+        if "Bad" in arg:
+            print(arg + ":1: error: incompatible types")
+            status = 1
+    print("@@thalia-exit " + str(status), flush=True)
+'''
+
+
+# A fake compiler server that writes its diagnostics slowly, one line at a
+# time.
+SLOW_SERVER = r'''
+import sys, time
+for line in sys.stdin:
+    for arg in line.rstrip("\n").split("\0"):
+        print(arg + ":1: error: incompatible types", flush=True)
+        time.sleep(0.001)
+    print("@@thalia-exit 1", flush=True)
+'''
+
+
+def test_compiler_daemon():
+    compiler_daemon = daemon.CompilerDaemon([sys.executable, "-c",
+                                             FAKE_SERVER])
+    status, output = compiler_daemon.compile(["-nowarn", "src/foo/Good.java"])
+    assert status
+    assert output == ""
+    proc = compiler_daemon.proc
+
+    status, output = compiler_daemon.compile(["src/foo/Bad.java",
+                                              "src/bar/Good.java"])
+    assert not status
+    assert output == "src/foo/Bad.java:1: error: incompatible types\n"
+    # The same server serves all requests.
+    assert compiler_daemon.proc is proc
+
+    status, output = compiler_daemon.compile(["crash"])
+    assert not status
+    assert "at jdk.Foo" in output
+    assert not compiler_daemon.is_alive()
+
+    # The server is restarted upon the next request.
+    status, _ = compiler_daemon.compile(["src/foo/Good.java"])
+    assert status
+    compiler_daemon.close()
+
+
+def test_compiler_daemon_threads():
+    compiler_daemon = daemon.CompilerDaemon([sys.executable, "-c",
+                                             SLOW_SERVER])
+
+    def compile_batch(i):
+        files = ["src/batch{}/Bad{}.java".format(i, j) for j in range(5)]
+        _, output = compiler_daemon.compile(files)
+        return output.splitlines() == [
+            f + ":1: error: incompatible types" for f in files]
+
+    # Concurrent requests do not mix up the output of the server.
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(compile_batch, range(16)))
+    compiler_daemon.close()
+
+
+def test_expand_arguments(tmp_path):
+    for pkg in ["foo", "bar"]:
+        (tmp_path / pkg).mkdir()
+        (tmp_path / pkg / "Main.java").write_text("")
+    compiler = JavaCompiler(str(tmp_path))
+    args = daemon.expand_arguments(compiler.get_compiler_cmd()[1:])
+    assert args == ["-nowarn",
+                    str(tmp_path / "bar" / "Main.java"),
+                    str(tmp_path / "foo" / "Main.java")]
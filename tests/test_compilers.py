@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+import pytest
+
+from src.compilers.java import JavaCompiler
+from src.compilers.kotlin import KotlinCompiler
+
+
+# The error patterns of the compilers do not match paths with dashes (e.g.,
+# those of the tmp_path fixture), so we use plain temporary directories.
+@pytest.fixture
+def batch_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def link_program(batch_dir, pid, filename):
+    # The layout of `spool_program` in thalia.py: a program is saved once
+    # in the directory of its test case and linked into a batch.
+    program = os.path.join(batch_dir, "tmp", str(pid), filename)
+    os.makedirs(os.path.dirname(program))
+    with open(program, "w") as f:
+        f.write("")
+    link = os.path.join(batch_dir, "batch", "src", "p" + str(pid), filename)
+    os.makedirs(os.path.dirname(link))
+    os.symlink(program, link)
+    return os.path.realpath(program), link
+
+
+@pytest.mark.parametrize("compiler_cls,filename,error", [
+    (JavaCompiler, "Main.java", "{}:3: error: incompatible types\n"),
+    (KotlinCompiler, "Main.kt", "{}:3:5: error: type mismatch\n"),
+])
+def test_resolved_paths_of_linked_programs(batch_dir, compiler_cls,
+                                           filename, error):
+    program1, link1 = link_program(batch_dir, 1, filename)
+    _, link2 = link_program(batch_dir, 2, filename)
+    compiler = compiler_cls(os.path.join(batch_dir, "batch", "src"))
+    # One error is reported for the resolved path and one for the link.
+    failed, _ = compiler.analyze_compiler_output(
+        error.format(program1) + error.format(link2))
+    assert set(failed) == {link1, link2}
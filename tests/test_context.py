@@ -0,0 +1,82 @@
+import pickle
+
+from src.ir import ast, kotlin_types as kt
+from src.ir.context import Context
+
+
+def var(name):
+    return ast.VariableDeclaration(name, ast.IntegerConstant(1, kt.Integer),
+                                   var_type=kt.Integer)
+
+
+def func(name):
+    return ast.FunctionDeclaration(name, [], kt.Unit, None,
+                                   ast.FunctionDeclaration.FUNCTION)
+
+
+def test_views_follow_updates():
+    context = Context()
+    glob = ('global',)
+    context.add_var(glob, 'x', var('x'))
+    context.add_func(glob, 'f', func('f'))
+    context.add_var(glob + ('f',), 'y', var('y'))
+    ns = glob + ('f',)
+
+    assert list(context.get_vars(ns)) == ['x', 'y']
+    assert list(context.get_vars(ns, glob=True)) == ['x', 'y']
+    assert list(context.get_vars(ns, only_current=True)) == ['y']
+    # The views are re-used until the context changes.
+    assert context.get_vars(ns) is context.get_vars(ns)
+
+    context.add_var(ns, 'z', var('z'))
+    assert list(context.get_vars(ns)) == ['x', 'y', 'z']
+    assert list(context.get_declarations(ns)) == ['x', 'f', 'y', 'z']
+    context.remove_var(glob, 'x')
+    assert list(context.get_vars(ns)) == ['y', 'z']
+    assert list(context.get_vars(glob, glob=True)) == ['y', 'z']
+
+    # A new function adds a namespace to the glob views.
+    context.add_func(glob, 'g', func('g'))
+    context.add_var(glob + ('g',), 'w', var('w'))
+    assert list(context.get_vars(glob, glob=True)) == ['w', 'y', 'z']
+    context.remove_func(glob, 'g')
+    assert list(context.get_vars(glob, glob=True)) == ['y', 'z']
+
+    context.add_var(ns, 'n', None)
+    assert 'n' not in context.get_vars(ns)
+    assert 'n' in context.get_vars(ns, none=True)
+
+    context.update_declarations(glob, {})
+    assert list(context.get_declarations(ns)) == ['y', 'z']
+    context.remove_namespace(ns)
+    assert context.get_vars(ns) == {}
+
+
+def test_views_are_not_pickled():
+    context = Context()
+    context.add_var(('global',), 'x', var('x'))
+    context.get_vars(('global', 'f'))
+    assert context._views
+    new_context = pickle.loads(pickle.dumps(context))
+    assert new_context._views is None
+    assert list(new_context.get_vars(('global', 'f'))) == ['x']
+
+
+def test_namespaces_decls_follow_updates():
+    context = Context()
+    glob = ('global',)
+    context.add_var(glob, 'x', var('x'))
+    context.add_func(glob, 'f', func('f'))
+    context.add_var(glob + ('f',), 'x', var('x'))
+    x_decls = {ns for ns, _ in context.get_namespaces_decls(glob, 'x', 'vars')}
+    assert x_decls == {glob + ('x',), glob + ('f', 'x')}
+    assert {ns for ns, _ in context.get_namespaces_decls(
+        glob + ('f',), 'x', 'vars', glob=False)} == {glob + ('f', 'x')}
+
+    # A new function adds its namespace to the search.
+    context.add_func(glob, 'g', func('g'))
+    context.add_var(glob + ('g',), 'x', var('x'))
+    assert len(context.get_namespaces_decls(glob, 'x', 'vars')) == 3
+    context.remove_func(glob, 'f')
+    assert {ns for ns, _ in context.get_namespaces_decls(
+        glob, 'x', 'vars')} == {glob + ('x',), glob + ('g', 'x')}
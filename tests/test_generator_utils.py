@@ -0,0 +1,30 @@
+from src.generators import utils as gu
+from src.ir import ast, types as tp, kotlin_types as kt
+
+
+def test_attribute_index():
+    foo = tp.SimpleClassifier("Foo", [])
+    bar = tp.SimpleClassifier("Bar", [foo])
+    type_param = tp.TypeParameter("T")
+    attrs = [
+        ast.FieldDeclaration("a", foo),
+        ast.FieldDeclaration("b", kt.Integer),
+        ast.FieldDeclaration("c", type_param),
+        ast.FieldDeclaration("d", bar),
+        ast.FunctionDeclaration(
+            "e", [], kt.String, None, ast.FunctionDeclaration.CLASS_METHOD,
+            type_parameters=[tp.TypeParameter("X")]),
+        ast.FieldDeclaration("f", kt.Nothing),
+    ]
+    index = gu.AttributeIndex(attrs)
+
+    def names(etype):
+        return [attr.name for attr in index.get_candidates(etype)]
+
+    # Attributes whose types contain type variables, parameterized functions
+    # and types with their own subtyping rules match every type.
+    assert names(foo) == ["a", "c", "d", "e", "f"]
+    assert names(bar) == ["c", "d", "e", "f"]
+    assert names(kt.Number) == ["b", "c", "e", "f"]
+    assert names(kt.String) == ["c", "e", "f"]
+    assert index.attributes == attrs
@@ -337,3 +337,25 @@ def test_get_fields_parameterized():
     assert_declarations(cls2.get_all_fields([cls1, cls2, cls3]),
                         [exp_field, field3])
 
+
+def test_get_callable_functions_parameterized():
+    type_param = TypeParameter("T")
+    body = Block([])
+    func = FunctionDeclaration(
+        "foo", [ParameterDeclaration("x", type_param)], type_param, body,
+        FunctionDeclaration.CLASS_METHOD)
+    cls1 = ClassDeclaration("A", [], type_parameters=[type_param],
+                            functions=[func])
+    cls2 = ClassDeclaration(
+        "B", [SuperClassInstantiation(cls1.get_type().new([String]), [])],
+        functions=[])
+
+    new_func, = cls2.get_callable_functions([cls1, cls2])
+    assert new_func is not func
+    assert new_func.get_type() == String
+    assert new_func.params[0].get_type() == String
+    # The signature is substituted without touching the parent's function,
+    # while the rest of the declaration is shared.
+    assert func.get_type() == type_param
+    assert func.params[0].get_type() == type_param
+    assert new_func.body is body
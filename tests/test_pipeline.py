@@ -0,0 +1,59 @@
+import threading
+
+from src.modules.pipeline import Pipeline
+
+
+def test_pipeline():
+    consumed = []
+    lock = threading.Lock()
+
+    def consumer(i, j):
+        with lock:
+            consumed.append(i + j)
+
+    pipeline = Pipeline(consumer, depth=2, workers=3)
+    for i in range(20):
+        pipeline.submit(i, 1)
+    pipeline.close()
+    assert sorted(consumed) == list(range(1, 21))
+
+
+def test_pipeline_back_pressure():
+    release = threading.Event()
+    started = threading.Event()
+    consumed = []
+
+    def consumer(i):
+        started.set()
+        release.wait()
+        consumed.append(i)
+
+    pipeline = Pipeline(consumer, depth=1, workers=1)
+    pipeline.submit(1)
+    started.wait()
+    # The consumer is busy, so the queue accepts exactly one more item.
+    pipeline.submit(2)
+    assert pipeline.queue.full()
+    producer = threading.Thread(target=pipeline.submit, args=(3,))
+    producer.start()
+    producer.join(timeout=0.1)
+    assert producer.is_alive()
+    release.set()
+    producer.join()
+    pipeline.close()
+    assert consumed == [1, 2, 3]
+
+
+def test_pipeline_consumer_error():
+    consumed = []
+
+    def consumer(i):
+        if i == 0:
+            raise ValueError("error")
+        consumed.append(i)
+
+    pipeline = Pipeline(consumer, depth=1)
+    pipeline.submit(0)
+    pipeline.submit(1)
+    pipeline.close()
+    assert consumed == [1]
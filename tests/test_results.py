@@ -0,0 +1,61 @@
+from src.modules import results
+
+
+def test_result_log(tmp_path):
+    path = results.get_results_path(str(tmp_path / "session"))
+    assert list(results.read_results(path)) == []
+    log = results.ResultLog(path)
+    log.append(1, {}, 10, 0, 1.5, 0.5)
+    log.append(11, {3: {"error": "crash"}, 7: {"error": "SHOULD NOT BE"}},
+               8, 2, 2.0, 1.0)
+    log.append(21, {12: {"error": "crash"}}, 9, 1, 0.5, 0.5)
+
+    assert len(list(results.read_results(path))) == 3
+    assert results.load_faults(path) == {
+        "3": {"error": "crash"},
+        "7": {"error": "SHOULD NOT BE"},
+        "12": {"error": "crash"},
+    }
+    crashes = results.iter_faults(path, lambda f: f["error"] == "crash")
+    assert [pid for pid, _ in crashes] == ["3", "12"]
+    assert results.summarize(path) == {
+        "totals": {"passed": 27, "failed": 3},
+        "synthesis_time": 4.0,
+        "compilation_time": 2.0,
+    }
+
+
+def test_result_log_truncated(tmp_path):
+    path = results.get_results_path(str(tmp_path))
+    log = results.ResultLog(path)
+    log.append(1, {1: {"error": "crash"}}, 0, 1, 0, 0)
+    # The run was killed in the middle of appending a batch.
+    with open(path, 'a') as out:
+        out.write('{"passed": 3, "fai')
+    assert results.load_faults(path) == {"1": {"error": "crash"}}
+
+    results.export_faults(path, str(tmp_path / "faults.json"))
+    with open(str(tmp_path / "faults.json")) as f:
+        assert f.read().startswith('{\n  "1"')
+
+    # A resumed run appends its batches on a new line.
+    log = results.ResultLog(path)
+    log.append(5, {5: {"error": "crash"}}, 0, 1, 0, 0)
+    assert list(results.load_faults(path)) == ["1", "5"]
+
+
+def test_filter_results(tmp_path):
+    path = results.get_results_path(str(tmp_path))
+    log = results.ResultLog(path)
+    log.append(1, {2: {"error": "crash"}}, 9, 1, 1.0, 1.0)
+    log.append(21, {}, 10, 0, 1.0, 1.0, worker=1)
+    log.append(11, {12: {"error": "crash"}}, 9, 1, 1.0, 1.0)
+    log.append(31, {}, 10, 0, 1.0, 1.0)
+    # A resumed run compiles again the batches after the checkpoint of every
+    # worker.
+    bounds = {0: 21, 1: 22}
+    results.filter_results(
+        path, lambda record: record["batch"] < bounds[record["worker"]])
+    assert [r["batch"] for r in results.read_results(path)] == [1, 21, 11]
+    assert results.summarize(path)["totals"] == {"passed": 28, "failed": 2}
+    assert list(results.load_faults(path)) == ["2", "12"]
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from src import utils
+from src.ir import ast, serialization, types as tp, kotlin_types as kt
+from src.translators.kotlin import KotlinTranslator
+from tests.resources import (program1, program2, program3, program4,
+                             program5, program6, program7, program8)
+
+
+PROGRAMS = [program1, program2, program3, program4, program5, program6,
+            program7, program8]
+
+
+def encode(obj, chunk_size=serialization.CHUNK_SIZE):
+    out = io.StringIO()
+    serialization.dump(obj, out, chunk_size)
+    return out.getvalue()
+
+
+def decode(data):
+    return serialization.load(io.StringIO(data))
+
+
+def translate(program):
+    return utils.translate_program(KotlinTranslator(), program)
+
+
+@pytest.mark.parametrize("resource", PROGRAMS)
+def test_roundtrip(resource):
+    data = encode(resource.program)
+    program = decode(data)
+    assert isinstance(program, ast.Program)
+    assert program.bt_factory is resource.program.bt_factory
+    assert translate(program) == translate(resource.program)
+    # The encoding is deterministic.
+    assert encode(program) == data
+    # Small chunks give the same program.
+    assert translate(decode(encode(program, chunk_size=3))) == \
+        translate(resource.program)
+
+
+def test_sharing_and_cycles():
+    type_param = tp.TypeParameter("T")
+    comparable = tp.TypeConstructor(
+        "Comparable", [tp.TypeParameter("X", tp.Contravariant)])
+    # T extends Comparable<T>
+    type_param.bound = comparable.new([type_param])
+    t1 = tp.ParameterizedType(comparable, [type_param])
+    t2 = tp.ParameterizedType(comparable, [type_param])
+    t2.type_args = t1.type_args
+    decoded = decode(encode({type_param: [t1, t2], "int": kt.Integer}))
+
+    t = decoded["int"]
+    assert isinstance(t, kt.IntegerType) and t.name == "Int"
+    new_type_param, (new_t1, new_t2) = next(iter(decoded.items()))
+    assert new_type_param.name == "T"
+    assert new_type_param.bound.type_args[0] is new_type_param
+    assert new_t1.type_args is new_t2.type_args
+    assert new_t1.t_constructor.type_parameters[0].variance is \
+        tp.Contravariant
+
+
+def test_sets():
+    foo = tp.SimpleClassifier("Foo")
+    bar = tp.SimpleClassifier("Bar", [foo])
+    type_param = tp.TypeParameter("T", bound=bar)
+    obj = [{foo, bar, type_param, kt.Integer, "foo"},
+           frozenset(["foo", 1, tp.Covariant, ("x", 1)])]
+    data = encode(obj)
+    decoded = decode(data)
+    assert decoded == obj
+    assert {t.name for t in decoded[0] if isinstance(t, tp.Type)} == {
+        "Foo", "Bar", "T", "Int"}
+    # The encoding does not depend on the order of the elements of the sets.
+    assert encode([set(reversed(list(obj[0]))),
+                   frozenset(reversed(list(obj[1])))]) == data
+    assert encode(decoded) == data
+
+
+def test_version():
+    data = encode(program1.program).split("\n", 1)
+    data[0] = data[0].replace('"version": 1', '"version": 0')
+    with pytest.raises(serialization.SerializationError):
+        decode("\n".join(data))
+    with pytest.raises(serialization.SerializationError):
+        decode(encode(program1.program).rsplit("\n", 2)[0])
+    with pytest.raises(serialization.SerializationError):
+        encode(object())
+
+
+def test_dump_and_load_program(tmp_path):
+    expected = translate(program1.program)
+    for program_format in ["pickle", "ir"]:
+        path = str(tmp_path / ("program." + program_format))
+        utils.dump_program(path, program1.program, program_format)
+        with open(path, 'rb') as f:
+            assert serialization.is_encoded(f) == (program_format == "ir")
+        assert translate(utils.load_program(path)) == expected
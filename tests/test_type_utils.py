@@ -224,6 +224,40 @@ def test_find_subtypes():
     assert_is_subset(subtypes, {bar, baz, qux_con})
 
 
+def test_type_index():
+    foo = tp.SimpleClassifier("Foo", [])
+    bar = tp.SimpleClassifier("Bar", [foo])
+    baz = tp.SimpleClassifier("Baz", [bar])
+    unrel = tp.SimpleClassifier("Unrel", [])
+    qux_con = tp.TypeConstructor("Qux", [tp.TypeParameter("T")],
+                                 supertypes=[foo])
+    fox = tp.SimpleClassifier("Fox", [qux_con.new([kt.String])])
+    type_param = tp.TypeParameter("T", bound=foo)
+    types = [foo, bar, baz, unrel, qux_con, fox, type_param, kt.Integer,
+             kt.Any]
+    index = tutils.TypeIndex(types)
+
+    for t in [foo, bar, baz, qux_con, fox]:
+        assert index.may_be_subtype(t, index.get_key(foo))
+    assert index.may_be_subtype(kt.Integer, index.get_key(kt.Number))
+    assert not index.may_be_subtype(foo, index.get_key(bar))
+    assert not index.may_be_subtype(kt.Any, index.get_key(kt.Number))
+    # Type parameters are not indexed, so they may be subtypes of anything.
+    assert index.may_be_subtype(type_param, index.get_key(foo))
+    assert not index.may_be_subtype(unrel, index.get_key(foo))
+    for etype in [foo, bar, qux_con.new([kt.String]), kt.Number, kt.Any]:
+        assert set(tutils.find_subtypes(etype, types, type_index=index)) == \
+            set(tutils.find_subtypes(etype, types))
+
+    # Re-adding a type updates its supertypes.
+    unrel = tp.SimpleClassifier("Unrel", [baz])
+    index.add(unrel)
+    assert index.may_be_subtype(unrel, index.get_key(foo))
+    # Types that are not indexed may be subtypes of anything.
+    index.remove(baz)
+    assert index.may_be_subtype(baz, index.get_key(unrel))
+
+
 def test_find_subtypes_param_type():
     foo = tp.SimpleClassifier("Foo", [])
     bar = tp.SimpleClassifier("Bar", [foo])
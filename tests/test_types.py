@@ -1,3 +1,6 @@
+import pickle
+from copy import deepcopy
+
 from src.ir import types as tp, kotlin_types as kt, java_types as jt, \
         groovy_types as gt
 
@@ -615,3 +618,58 @@ def test_raw_types():
     assert raw.get_name() == "B"
     assert raw.t_constructor == b
     assert raw.supertypes == [jt.String, a.new([tp.WildCardType()]), jt.Object]
+
+
+def test_cached_hash():
+    type_param = tp.TypeParameter("T")
+    type_params = {type_param}
+    type_param.name = "X"
+    assert hash(type_param) == hash(tp.TypeParameter("X"))
+    type_param.variance = tp.Covariant
+    assert hash(type_param) == hash(tp.TypeParameter("X", tp.Covariant))
+    assert tp.TypeParameter("T") not in type_params
+
+    copied = pickle.loads(pickle.dumps(type_param))
+    assert copied == type_param
+    assert hash(copied) == hash(type_param)
+    assert copied.variance is tp.Covariant
+    assert deepcopy(tp.Invariant) is tp.Invariant
+
+
+def test_load_old_variances():
+    # [TypeParameter("T", Covariant), Covariant], as pickled before variances
+    # were interned.
+    data = (
+        b'\x80\x05\x95~\x00\x00\x00\x00\x00\x00\x00]\x94(\x8c\x0csrc.ir.types'
+        b'\x94\x8c\rTypeParameter\x94\x93\x94)\x81\x94}\x94(\x8c\x04name\x94'
+        b'\x8c\x01T\x94\x8c\nsupertypes\x94]\x94\x8c\x08variance\x94h\x01\x8c'
+        b'\x08Variance\x94\x93\x94)\x81\x94}\x94\x8c\x05value\x94K\x01sb\x8c'
+        b'\x05bound\x94Nubh\re.'
+    )
+    loaded, variance = pickle.loads(data)
+    assert variance == tp.Covariant
+    assert variance != tp.Contravariant
+    assert loaded.variance is variance
+    assert loaded.is_covariant()
+    assert loaded == tp.TypeParameter("T", tp.Covariant)
+    assert hash(loaded) == hash(tp.TypeParameter("T", tp.Covariant))
+
+
+def test_type_substitution_shares_components():
+    type_param1 = tp.TypeParameter("T1")
+    type_param2 = tp.TypeParameter("T2")
+    foo = tp.TypeConstructor("Foo", [type_param1, type_param2])
+    bar = tp.TypeConstructor("Bar", [tp.TypeParameter("X")])
+    bar_t = bar.new([kt.String])
+    wildcard = tp.WildCardType(bar_t, tp.Covariant)
+    foo_t = foo.new([wildcard, type_param1])
+
+    ptype = tp.substitute_type(foo_t, {type_param1: kt.Integer})
+    assert ptype.type_args == [wildcard, kt.Integer]
+    # The type arguments that are not affected by the substitution are
+    # shared, but the substituted type is always a new type.
+    assert ptype.type_args[0] is wildcard
+    ptype = tp.substitute_type(foo_t, {})
+    assert ptype == foo_t
+    assert ptype is not foo_t
+    assert ptype.type_args is not foo_t.type_args
@@ -0,0 +1,17 @@
+from src import utils
+
+
+def test_top_level_split():
+    assert utils.top_level_split("A<B, C<D, E>>, F") == ["A<B, C<D, E>>", "F"]
+    assert utils.top_level_split("A") == ["A"]
+    assert utils.top_level_split("") == []
+    # A trailing delimiter does not give an empty last part.
+    assert utils.top_level_split("A,") == ["A"]
+    assert utils.top_level_split("A, ") == ["A", ""]
+    assert utils.top_level_split("A,,B") == ["A", "", "B"]
+    assert utils.top_level_split(
+        "(A, B) => C[D, E]", signs=(["(", "["], [")", "]"]), delim="=") == \
+        ["(A, B)", "> C[D, E]"]
+    # The signs and the delimiter are not regex metacharacters.
+    assert utils.top_level_split(
+        "a.b(c.d).e", signs=(["("], [")"]), delim=".") == ["a", "b(c.d)", "e"]
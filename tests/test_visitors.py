@@ -0,0 +1,46 @@
+import pytest
+
+from src.ir import ast, kotlin_types as kt
+from src.ir.visitors import DefaultVisitor
+from tests.resources import program1
+
+
+class Counter(DefaultVisitor):
+    def __init__(self):
+        self.nodes = []
+
+    def result(self):
+        return self.nodes
+
+    def visit_integer_constant(self, node):
+        self.nodes.append(node)
+
+
+class FuncCounter(Counter):
+    def visit_func_decl(self, node):
+        self.nodes.append(node)
+        return super().visit_func_decl(node)
+
+
+def test_dispatch_per_visitor_class():
+    constant = ast.IntegerConstant(1, kt.Integer)
+    block = ast.Block([constant])
+    func = ast.FunctionDeclaration("f", [], kt.Integer, block,
+                                   ast.FunctionDeclaration.FUNCTION)
+    counter = Counter()
+    counter.visit(func)
+    assert counter.result() == [constant]
+    # The table of a subclass picks up the methods that it overrides.
+    counter = FuncCounter()
+    counter.visit(func)
+    assert counter.result() == [func, constant]
+    assert Counter._dispatch_table[ast.FunctionDeclaration] is \
+        DefaultVisitor.visit_func_decl
+
+    counter = FuncCounter()
+    counter.visit(program1.program)
+    assert counter.result()
+    assert all(isinstance(n, ast.FunctionDeclaration)
+               for n in counter.result())
+    with pytest.raises(Exception):
+        counter.visit(object())
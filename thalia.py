@@ -1,5 +1,6 @@
 #! /usr/bin/env python3
 # pylint: disable=too-few-public-methods
+from copy import deepcopy
 from datetime import datetime
 import json
 import functools
@@ -9,15 +10,19 @@ import tempfile
 import sys
 import subprocess as sp
 import shutil
+import threading
 import time
 import traceback
 from collections import namedtuple, OrderedDict
 
 from src.args import args as cli_args, validate_args, pre_process_args
 from src import utils
-from src.compilers import COMPILERS
+from src.compilers import COMPILERS, daemon
 from src.translators import TRANSLATORS
-from src.modules.processor import ProgramProcessor
+from src.modules import checkpoint, results
+from src.modules.bisection import bisect
+from src.modules.pipeline import Pipeline
+from src.modules.processor import ProgramProcessor, build_api_graph
 
 
 STOP_COND = False
@@ -38,6 +43,8 @@ STATS = {
         "library_path": cli_args.library_path,
         "erase_types": cli_args.erase_types,
         "inject_type_error": cli_args.inject_type_error,
+        "seed": cli_args.seed,
+        "shard": cli_args.shard,
     },
     "totals": {
         "passed": 0,
@@ -45,11 +52,25 @@ STATS = {
     },
     "synthesis_time": 0,
     "compilation_time": 0,
-    "faults": {}
+}
+# The statistics of the batches up to the next program id of the latest
+# checkpoint. Batches may finish out of order, so STATS may include batches
+# after this id, which a resumed run generates again.
+CHECKPOINT_STATS = {
+    "totals": {
+        "passed": 0,
+        "failed": 0
+    },
+    "synthesis_time": 0,
+    "compilation_time": 0,
 }
 TEMPLATE_MSG = (u"Test Programs Passed {} / {} \u2714\t\t"
                 "Test Programs Failed {} / {} \u2718\r")
 ProgramRes = namedtuple("ProgramRes", ['failed', 'stats'])
+# Protects STATS when the results of batches are processed concurrently.
+STATS_LOCK = threading.Lock()
+# The log of the results of the session, opened by main().
+RESULT_LOG = None
 
 
 # ============= util functions =======================
@@ -109,11 +130,12 @@ def run_command(arguments, get_stdout=True):
         return status, stderr.
     """
     is_groovy = arguments[0] == "groovyc"
+    cwd = None
     if is_groovy:
-        tmp_src_dir = os.path.join(cli_args.test_directory, 'tmp')
-        utils.mkdir(tmp_src_dir)
-        old_cwd = os.getcwd()
-        os.chdir(tmp_src_dir)
+        # We do not change the working directory of the current process,
+        # because compilation may run concurrently with generation.
+        cwd = os.path.join(cli_args.test_directory, 'tmp')
+        utils.mkdir(cwd)
     try:
         is_windows = os.name == 'nt'
         sys_env = os.environ.copy()
@@ -122,12 +144,10 @@ def run_command(arguments, get_stdout=True):
             # FIXME the wildcard * maybe won't work in Windows
             arguments = ' '.join(arguments)
         cmd = sp.Popen(arguments, stdout=sp.PIPE,
-                       stderr=sp.STDOUT, shell=True, env=sys_env)
+                       stderr=sp.STDOUT, shell=True, env=sys_env, cwd=cwd)
         stdout, stderr = cmd.communicate()
     except sp.CalledProcessError as err:
         return False, err
-    if is_groovy:
-        os.chdir(old_cwd)
     stderr = stderr.decode("utf-8") if stderr else ""
     stdout = stdout.decode("utf-8") if stdout else ""
     err = stdout if get_stdout else stderr
@@ -135,6 +155,16 @@ def run_command(arguments, get_stdout=True):
     return status, err
 
 
+def run_compiler(compiler):
+    """Compile the programs of the given compiler using the selected backend.
+    Returns:
+        return status, compiler output.
+    """
+    if cli_args.compiler_backend == "daemon":
+        return daemon.compile_with_daemon(compiler)
+    return run_command(compiler.get_compiler_cmd())
+
+
 def get_generator_dir(pid):
     return os.path.join(cli_args.test_directory, "generator",
                         "iter_" + str(pid))
@@ -150,20 +180,100 @@ def save_program(program, program_str, program_file):
     utils.mkdir(dst_dir)
     # Save the program
     utils.save_text(program_file, program_str)
-    utils.dump_program(program_file + ".bin", program)
+    utils.dump_program(program_file + ".bin", program,
+                       cli_args.program_format)
+
+
+def spool_program(program, program_str, spool_file, program_file):
+    """
+    Save a program once into the directory of its test case (the spool),
+    i.e., the directory that is reported when the program reveals a fault,
+    and link the given program file of the batch to the saved program.
+    """
+    save_program(program, program_str, spool_file)
+    utils.mkdir(os.path.dirname(program_file))
+    try:
+        os.symlink(os.path.abspath(spool_file), program_file)
+    except OSError:
+        # Symbolic links may not be supported (e.g., on Windows).
+        shutil.copyfile(spool_file, program_file)
 
 
 def save_stats():
     dst_dir = os.path.join(cli_args.test_directory)
-    faults_file = os.path.join(dst_dir, 'faults.json')
     stats_file = os.path.join(dst_dir, "stats.json")
     utils.mkdir(dst_dir)
-    faults = STATS.pop('faults')
-    with open(faults_file, 'w') as out:
-        json.dump(faults, out, indent=2)
     with open(stats_file, 'w') as out:
         json.dump(STATS, out, indent=2)
-    STATS['faults'] = faults
+
+
+def save_faults():
+    # The faults of the session are appended to the result log batch by
+    # batch, faults.json is only derived from the log at the end of the run.
+    results.export_faults(
+        RESULT_LOG.path, os.path.join(cli_args.test_directory, 'faults.json'))
+
+
+def get_shard(worker=0, workers=1):
+    """Return the shard of the API encodings enumerated by a worker."""
+    shard, shards = cli_args.shard or (0, 1)
+    return shard + shards * worker, shards * workers
+
+
+def save_run_checkpoint(iteration, time_passed, generators):
+    """
+    Save the state of the run. `generators` maps every worker to the state of
+    its generator, along with the id of the first program of the batches that
+    this state does not cover.
+    """
+    with STATS_LOCK:
+        stats = deepcopy(STATS)
+        stats.update(deepcopy(CHECKPOINT_STATS))
+    checkpoint.save_checkpoint(
+        checkpoint.get_run_path(cli_args.test_directory), {
+            "seed": cli_args.seed,
+            "workers": cli_args.workers,
+            "shard": cli_args.shard,
+            "iteration": iteration,
+            "time_passed": time_passed,
+            "stats": stats,
+            "generators": generators,
+        })
+
+
+def get_generator_checkpoint(worker=0):
+    """Return the state of the generator of a worker to resume from."""
+    state = cli_args.resume_state
+    if state is None or worker not in state["generators"]:
+        return None
+    return state["generators"][worker][1]
+
+
+def restore_run():
+    """
+    Restore the statistics of the interrupted run, and return the id of the
+    next program along with the elapsed time.
+    """
+    state = cli_args.resume_state
+    if state is None:
+        return 1, 0
+    STATS.update(state["stats"])
+    for key in CHECKPOINT_STATS:
+        CHECKPOINT_STATS[key] = deepcopy(state["stats"][key])
+    # The batches after the checkpoint of every worker are generated and
+    # compiled again, so we drop them from the log. This way, the log agrees
+    # with the restored statistics.
+    bounds = {worker: bound
+              for worker, (bound, _) in state["generators"].items()}
+    results.filter_results(
+        RESULT_LOG.path,
+        lambda record: record["batch"] < bounds.get(record["worker"], 0))
+    # Batches finished after the last checkpoint may have stored programs
+    # with greater ids.
+    pids = [int(d) for d in os.listdir(cli_args.test_directory)
+            if d.isdigit()]
+    return max([state["iteration"]] + [pid + 1 for pid in pids]), \
+        state["time_passed"]
 
 
 def stop_condition(iteration, time_passed):
@@ -177,18 +287,45 @@ def stop_condition(iteration, time_passed):
     return True
 
 
-def update_stats(res, batch, batch_time):
+def merge_stats(stats, batch_stats):
+    stats['totals']['failed'] += batch_stats['totals']['failed']
+    stats['totals']['passed'] += batch_stats['totals']['passed']
+    stats["synthesis_time"] += batch_stats["synthesis_time"]
+    stats["compilation_time"] += batch_stats["compilation_time"]
+
+
+def checkpoint_stats(batch_stats):
+    if batch_stats is None:
+        # The batch failed, so there are no statistics for it.
+        return
+    with STATS_LOCK:
+        merge_stats(CHECKPOINT_STATS, batch_stats)
+
+
+def update_stats(start_index, res, batch, batch_time, worker=0):
+    """
+    Record the results of the batch starting at the given program id, and
+    return the statistics of it.
+    """
     res, compilation_time = res
     failed = len(res)
     passed = batch - failed
-    STATS['totals']['failed'] += failed
-    STATS['totals']['passed'] += passed
-    STATS["synthesis_time"] += batch_time
-    STATS["compilation_time"] += compilation_time
-    STATS['faults'].update(res)
-    if not cli_args.debug:
-        print_msg()
-    save_stats()
+    batch_stats = {
+        "totals": {
+            "passed": passed,
+            "failed": failed
+        },
+        "synthesis_time": batch_time,
+        "compilation_time": compilation_time,
+    }
+    with STATS_LOCK:
+        merge_stats(STATS, batch_stats)
+        RESULT_LOG.append(start_index, res, passed, failed, batch_time,
+                          compilation_time, worker)
+        if not cli_args.debug:
+            print_msg()
+        save_stats()
+    return batch_stats
 
 
 def get_batches(programs):
@@ -197,20 +334,40 @@ def get_batches(programs):
     return min(cli_args.batch, cli_args.iterations - programs)
 
 
+def get_packages(pid):
+    """Return the names of the two packages of the program with the given id."""
+    if cli_args.seed is None:
+        return utils.random.word(), utils.random.word()
+    # Derive the names from the seed and the program id, so that they do not
+    # depend on the programs generated before (e.g., by another shard).
+    with utils.random.isolated(cli_args.seed, "packages", pid):
+        utils.random.reset_word_pool()
+        return utils.random.word(), utils.random.word()
+
+
 def process_cp_transformations(pid, dirname, translator, proc,
-                               program, package_name):
-    program_str = None
+                               program, package_name, program_str=None):
+    """
+    Apply the correctness-preserving transformations to the given program,
+    and save the resulting program into the directory of the given package.
+
+    If given, `program_str` is the translation of the initial program. It
+    is re-used when no transformation changes the program.
+    """
     while proc.can_transform():
         res = proc.transform_program(program)
         if res is None:
+            # A transformation that has not transformed the program leaves
+            # it intact, so its translation is still valid.
             continue
         program, oracle = res
+        program_str = None
         if cli_args.keep_all:
             # Save every program resulted by the current transformation.
             program_str = utils.translate_program(translator, program)
             save_program(
                 program,
-                utils.translate_program(translator, program),
+                program_str,
                 os.path.join(
                     get_transformations_dir(
                         pid, proc.current_transformation - 1),
@@ -222,8 +379,7 @@ def process_cp_transformations(pid, dirname, translator, proc,
                             translator.get_filename())
     dst_file2 = os.path.join(cli_args.test_directory, 'tmp', str(pid),
                              translator.get_filename())
-    save_program(program, program_str, dst_file)
-    save_program(program, program_str, dst_file2)
+    spool_program(program, program_str, dst_file2, dst_file)
     return dst_file
 
 
@@ -234,9 +390,9 @@ def process_ncp_transformations(pid, dirname, translator, proc,
     if res is None:
         return None
     program, injected_err = res
+    program_str = utils.translate_program(translator, program)
     if cli_args.keep_all:
         # Save every program resulted by the current transformation.
-        program_str = utils.translate_program(translator, program)
         save_program(
             program,
             program_str,
@@ -247,9 +403,7 @@ def process_ncp_transformations(pid, dirname, translator, proc,
                             translator.get_filename())
     dst_file2 = os.path.join(cli_args.test_directory, 'tmp', str(pid),
                              translator.get_incorrect_filename())
-    program_str = utils.translate_program(translator, program)
-    save_program(program, program_str, dst_file)
-    save_program(program, program_str, dst_file2)
+    spool_program(program, program_str, dst_file2, dst_file)
     return dst_file, injected_err
 
 
@@ -280,15 +434,18 @@ def gen_program(pid, dirname, packages, program_processor=None):
         if cli_args.examine:
             print("pp program.context._context (to print the context)")
             __import__('ipdb').set_trace()
+        program_str = None
         if cli_args.keep_all:
             # Save the initial program.
+            program_str = utils.translate_program(translator, program)
             save_program(
                 program,
-                utils.translate_program(translator, program),
+                program_str,
                 os.path.join(get_generator_dir(pid), translator.get_filename())
             )
         correct_program = process_cp_transformations(
-            pid, dirname, translator, proc, program, packages[0])
+            pid, dirname, translator, proc, program, packages[0],
+            program_str)
         stats = {
             'transformations': [t.get_name()
                                 for t in proc.get_transformations()],
@@ -344,7 +501,7 @@ def _report_failed(pid, tid, compiler, oracle):
         program_file = os.path.join(get_transformations_dir(pid, tid),
                                     translator.get_filename())
         compiler = COMPILERS[cli_args.language](program_file)
-        status, _ = run_command(compiler.get_compiler_cmd())
+        status, _ = run_compiler(compiler)
         if status == oracle:
             dst_file = os.path.join(cli_args.test_directory, 'tmp', str(pid),
                                     "initial_program.kt")
@@ -361,6 +518,47 @@ def _report_failed(pid, tid, compiler, oracle):
         tid -= 1
 
 
+def bisect_crash(oracles, crash_msg):
+    """
+    Find the programs of a crashing batch that make the compiler crash.
+
+    The programs of the batch are recompiled in halves (see
+    `src.modules.bisection`), using at most --max-bisection-compilations
+    compiler invocations. It returns the ids of the suspected programs along
+    with the crash message of the compiler.
+    """
+    pids = [pid for pid, proc_res in oracles.items() if not proc_res.failed]
+    if cli_args.max_bisection_compilations == 0 or len(pids) <= 1:
+        return pids, crash_msg
+    filter_patterns = utils.path2set(cli_args.error_filter_patterns)
+
+    def crashes(subset):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for pid in subset:
+                for program in oracles[pid].stats['programs']:
+                    package_dir = os.path.dirname(program)
+                    shutil.copytree(package_dir, os.path.join(
+                        tmpdir, 'src', os.path.basename(package_dir)))
+            compiler = COMPILERS[cli_args.language](
+                os.path.join(tmpdir, 'src'), filter_patterns,
+                cli_args.library_path)
+            _, err = run_compiler(compiler)
+            compiler.analyze_compiler_output(err)
+            return compiler.crash_msg
+        finally:
+            shutil.rmtree(tmpdir)
+
+    # The compiler daemon serves one request at a time.
+    workers = 1 if cli_args.compiler_backend == "daemon" else 2
+    suspects, msg, invocations = bisect(
+        pids, crashes, cli_args.max_bisection_compilations, workers)
+    if cli_args.debug:
+        print('Bisection isolated {} out of {} programs in {} '
+              'compilations'.format(len(suspects), len(pids), invocations))
+    return suspects, msg or crash_msg
+
+
 def check_oracle(dirname, oracles):
     """
     This function is responsible for checking the oracle of the generated
@@ -380,10 +578,9 @@ def check_oracle(dirname, oracles):
     filter_patterns = utils.path2set(cli_args.error_filter_patterns)
     compiler = COMPILERS[cli_args.language](filename, filter_patterns,
                                             cli_args.library_path)
-    command_args = compiler.get_compiler_cmd()
     # At this point, we run the compiler
     start_time = time.time()
-    _, err = run_command(command_args)
+    _, err = run_compiler(compiler)
     compilation_time = time.time() - start_time
     # TODO In case there is an error in the compiler output and none of the
     # programs match with regex to that error, it means that something bad
@@ -395,17 +592,21 @@ def check_oracle(dirname, oracles):
     failed, _ = compiler.analyze_compiler_output(err)
     if compiler.crash_msg:
         # We just found a compiler crash.
-        shutil.rmtree(dirname)
         output = {}
         if cli_args.debug:
             print('We found compiler crash')
-        for pid, proc_res in oracles.items():
-            if not proc_res.failed:
-                shutil.copytree(
-                    os.path.join(cli_args.test_directory, 'tmp', str(pid)),
-                    os.path.join(cli_args.test_directory, str(pid)))
-                proc_res.stats['error'] = compiler.crash_msg
-                output[pid] = proc_res.stats
+        # Report only the programs that the bisection could not rule out.
+        start_time = time.time()
+        suspects, crash_msg = bisect_crash(oracles, compiler.crash_msg)
+        compilation_time += time.time() - start_time
+        shutil.rmtree(dirname)
+        for pid in suspects:
+            proc_res = oracles[pid]
+            shutil.copytree(
+                os.path.join(cli_args.test_directory, 'tmp', str(pid)),
+                os.path.join(cli_args.test_directory, str(pid)))
+            proc_res.stats['error'] = crash_msg
+            output[pid] = proc_res.stats
         return output, compilation_time
 
     output = {}
@@ -475,15 +676,10 @@ def check_oracle_mul(dirname, oracles):
         return {}, 0
 
 
-def _run(process_program, process_res):
+def _run(process_program, process_res, program_processor=None,
+         iteration=1, time_passed=0):
     logging()
-    iteration = 1
-    time_passed = 0
-    start_time = time.time()
-    program_processor = None
-    if cli_args.workers is None or cli_args.debug:
-        # We do not know pid yet.
-        program_processor = ProgramProcessor(None, cli_args)
+    start_time = time.time() - time_passed
     while stop_condition(iteration, time_passed):
         try:
             utils.random.reset_word_pool()
@@ -491,9 +687,9 @@ def _run(process_program, process_res):
             res = []
             batches = get_batches(iteration - 1)
             for i in range(batches):
-                packages = (utils.random.word(), utils.random.word())
                 dirname = os.path.join(tmpdir, 'src')
                 pid = iteration + i
+                packages = get_packages(pid)
                 args = (pid, dirname, packages)
                 if program_processor:
                     # Set pid to program processor
@@ -512,11 +708,40 @@ def _run(process_program, process_res):
 
 
 def run():
+    pipeline = None
+    checkpointer = None
+    iteration, time_passed = restore_run()
+    start_time = time.time() - time_passed
+    # We do not know pid yet.
+    program_processor = ProgramProcessor(None, cli_args, shard=get_shard())
+    if cli_args.generator == "api":
+        checkpointer = checkpoint.Checkpointer(
+            lambda state: save_run_checkpoint(*state), merge=checkpoint_stats)
+        state = get_generator_checkpoint()
+        if state is not None:
+            program_processor.restore_checkpoint(state)
 
     def process_program(pid, dirname, packages, program_processor):
         return gen_program(pid, dirname, packages, program_processor)
 
+    def check_batch(testdir, oracles, batch, batch_time, start_index):
+        batch_stats = None
+        try:
+            res = ({}, 0) if cli_args.dry_run else check_oracle(testdir,
+                                                                oracles)
+            batch_stats = update_stats(start_index, res, batch, batch_time)
+        finally:
+            # A failed batch is done as well, otherwise the batches after it
+            # would never be checkpointed.
+            if checkpointer:
+                checkpointer.done(start_index, batch_stats)
+
     def process_res(start_index, res, testdir, batch):
+        if checkpointer:
+            checkpointer.add(start_index, (
+                start_index + batch, time.time() - start_time,
+                {0: (start_index + batch,
+                     program_processor.get_checkpoint())}))
         oracles = OrderedDict()
         batch = min(len(res), batch)
         for i, r in enumerate(res):
@@ -524,13 +749,29 @@ def run():
 
         batch_time = functools.reduce(lambda acc, x: acc + x.stats["time"],
                                       res, 0)
-        res = ({}, 0) if cli_args.dry_run else check_oracle(testdir, oracles)
-        update_stats(res, batch, batch_time)
+        if pipeline:
+            # Hand the batch over to the compiler threads, and continue with
+            # the generation of the next batch.
+            pipeline.submit(testdir, oracles, batch, batch_time, start_index)
+        else:
+            check_batch(testdir, oracles, batch, batch_time, start_index)
 
+    if cli_args.pipeline_depth:
+        pipeline = Pipeline(check_batch, cli_args.pipeline_depth,
+                            cli_args.compiler_threads,
+                            cli_args.print_stacktrace)
     try:
-        _run(process_program, process_res)
+        _run(process_program, process_res, program_processor, iteration,
+             time_passed)
     except KeyboardInterrupt:
         pass
+    if pipeline:
+        try:
+            pipeline.close()
+        except KeyboardInterrupt:
+            pass
+    if checkpointer:
+        checkpointer.flush()
     path = os.path.join(cli_args.test_directory, 'tmp')
     if os.path.exists(path):
         shutil.rmtree(path)
@@ -555,7 +796,7 @@ def run_parallel():
                                       res, 0)
 
         def update(res):
-            update_stats(res, batch, batch_time)
+            update_stats(start_index, res, batch, batch_time)
 
         try:
             res = [r.get() for r in res]
@@ -587,14 +828,139 @@ def run_parallel():
     print("Total faults: " + str(STATS['totals']['failed']))
 
 
+def gen_api_shard(shard, counter, queue, start_time, api_graph):
+    """
+    This function is the body of a worker process in the parallel mode of the
+    API-based generator.
+
+    The worker uses the given API graph, which the main process builds once
+    for all workers, and enumerates only the programs that belong to the
+    given shard of the APIs. It claims the id of every program from the
+    shared counter right before generating the program, so that the worker
+    stops claiming ids as soon as its shard has been exhausted. The worker
+    compiles its programs in batches, and sends the results to the main
+    process through the given queue, along with the state of its generator
+    after the batch. The main process checkpoints these states together with
+    the statistics of the run. A `None` item signals that the worker has
+    finished.
+    """
+    global STOP_COND
+    try:
+        program_processor = ProgramProcessor(
+            None, cli_args, shard=get_shard(shard, cli_args.workers),
+            api_graph=api_graph)
+        state = get_generator_checkpoint(shard)
+        if state is not None:
+            program_processor.restore_checkpoint(state)
+        while True:
+            utils.random.reset_word_pool()
+            tmpdir = tempfile.mkdtemp()
+            dirname = os.path.join(tmpdir, 'src')
+            oracles = OrderedDict()
+            for _ in range(cli_args.batch):
+                with counter.get_lock():
+                    pid = counter.value
+                    if not stop_condition(pid, time.time() - start_time):
+                        break
+                    counter.value += 1
+                packages = get_packages(pid)
+                program_processor.proc_id = pid
+                r = gen_program(pid, dirname, packages, program_processor)
+                if r is None:
+                    # This shard has been exhausted, so we give the id back,
+                    # unless another worker has claimed an id after it.
+                    with counter.get_lock():
+                        if counter.value == pid + 1:
+                            counter.value = pid
+                    break
+                oracles[pid] = r
+            if not oracles:
+                # This shard has been exhausted.
+                shutil.rmtree(tmpdir)
+                break
+            batch_time = functools.reduce(
+                lambda acc, x: acc + x.stats["time"], oracles.values(), 0)
+            res = ({}, 0) if cli_args.dry_run else check_oracle(tmpdir,
+                                                                 oracles)
+            # The ids of a batch are increasing but not necessarily
+            # consecutive, as the workers claim them concurrently.
+            queue.put((shard, program_processor.get_checkpoint(),
+                       (next(iter(oracles)), res, len(oracles), batch_time)))
+    except KeyboardInterrupt:
+        STOP_COND = True
+    finally:
+        queue.put(None)
+
+
+def run_parallel_api():
+    logging()
+    iteration, time_passed = restore_run()
+    counter = mp.Value('i', iteration)
+    queue = mp.Queue()
+    start_time = time.time() - time_passed
+    checkpointer = checkpoint.Checkpointer(
+        lambda state: save_run_checkpoint(*state), merge=checkpoint_stats)
+    # Every worker gets its own copy of the API graph, so the workers can
+    # modify their graphs while generating programs.
+    api_graph = build_api_graph(cli_args,
+                                cli_args.options["Generator"]["api"])
+    workers = [
+        mp.Process(target=gen_api_shard,
+                   args=(shard, counter, queue, start_time, api_graph))
+        for shard in range(cli_args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        finished = 0
+        batches = 0
+        # The state of the generator of every worker after its latest batch.
+        generators = {}
+        while finished < len(workers):
+            res = queue.get()
+            if res is None:
+                finished += 1
+                continue
+            shard, generator_state, (start_index, *res) = res
+            batch_stats = update_stats(start_index, *res, worker=shard)
+            generators[shard] = (start_index + 1, generator_state)
+            batches += 1
+            checkpointer.add(batches, (counter.value,
+                                       time.time() - start_time,
+                                       dict(generators)))
+            checkpointer.done(batches, batch_stats)
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+    checkpointer.flush()
+    path = os.path.join(cli_args.test_directory, 'tmp')
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    print()
+    print("Total faults: " + str(STATS['totals']['failed']))
+
+
 def main():
+    global RESULT_LOG
     validate_args(cli_args)
     pre_process_args(cli_args)
+    RESULT_LOG = results.ResultLog(
+        results.get_results_path(cli_args.test_directory))
 
-    if cli_args.debug or cli_args.workers is None:
-        run()
-    else:
-        run_parallel()
+    try:
+        if cli_args.debug or cli_args.workers is None:
+            run()
+        elif cli_args.generator == "api":
+            run_parallel_api()
+        else:
+            run_parallel()
+    finally:
+        # Also export the faults when the run stops early (e.g., on the
+        # first mismatch in debug mode).
+        save_faults()
 
 
 if __name__ == "__main__":